@@ -7,41 +7,45 @@ import tempfile
 from pathlib import Path
 
 import pytest
-import yaml
+
+from thinkiplex.utils._yaml import safe_dump
 
 
 @pytest.fixture
 def temp_config_file():
     """Create a temporary configuration file."""
-    with tempfile.NamedTemporaryFile(suffix=".yaml", delete=False) as f:
-        config = {
-            "global": {
-                "base_dir": "/tmp/thinkiplex",
+    fd, name = tempfile.mkstemp(suffix=".yaml")
+    os.close(fd)
+    path = Path(name)
+
+    config = {
+        "global": {
+            "base_dir": "/tmp/thinkiplex",
+            "video_quality": "720p",
+            "extract_audio": True,
+            "audio_quality": 0,
+            "audio_format": "mp3",
+            "ffmpeg_presentation_merge": True,
+        },
+        "courses": {
+            "test-course": {
+                "course_link": "https://example.thinkific.com/courses/take/test-course",
+                "show_name": "Test Course",
+                "season": "01",
                 "video_quality": "720p",
                 "extract_audio": True,
                 "audio_quality": 0,
                 "audio_format": "mp3",
-                "ffmpeg_presentation_merge": True,
-            },
-            "courses": {
-                "test-course": {
-                    "course_link": "https://example.thinkific.com/courses/take/test-course",
-                    "show_name": "Test Course",
-                    "season": "01",
-                    "video_quality": "720p",
-                    "extract_audio": True,
-                    "audio_quality": 0,
-                    "audio_format": "mp3",
-                    "client_date": "test-date",
-                    "cookie_data": "test-cookie",
-                    "video_download_quality": "720p",
-                }
-            },
-        }
-        yaml.dump(config, f)
-        
-    yield f.name
-    os.unlink(f.name)
+                "client_date": "test-date",
+                "cookie_data": "test-cookie",
+                "video_download_quality": "720p",
+            }
+        },
+    }
+    path.write_bytes(safe_dump(config, encoding="utf-8"))
+
+    yield str(path)
+    path.unlink()
 
 
 @pytest.fixture
@@ -4,10 +4,11 @@ Tests for the configuration utilities.
 
 import os
 import tempfile
+from pathlib import Path
 
 import pytest
-import yaml
 
+from thinkiplex.utils._yaml import safe_dump
 from thinkiplex.utils.config import Config
 from thinkiplex.utils.exceptions import ConfigError, ValidationError
 
@@ -64,22 +65,25 @@ def test_set_configuration_value(config, temp_config_file):
 
 def test_validation_error():
     """Test validation error for invalid configuration."""
-    with tempfile.NamedTemporaryFile(suffix=".yaml", delete=False) as f:
-        config = {
-            "global": {
-                "base_dir": "/tmp/thinkiplex",
-                "video_quality": "invalid-quality",  # Invalid value
-                "extract_audio": True,
-                "audio_quality": 0,
-                "audio_format": "mp3",
-                "ffmpeg_presentation_merge": True,
-            },
-            "courses": {},
-        }
-        yaml.dump(config, f)
-    
+    fd, name = tempfile.mkstemp(suffix=".yaml")
+    os.close(fd)
+    path = Path(name)
+
+    config = {
+        "global": {
+            "base_dir": "/tmp/thinkiplex",
+            "video_quality": "invalid-quality",  # Invalid value
+            "extract_audio": True,
+            "audio_quality": 0,
+            "audio_format": "mp3",
+            "ffmpeg_presentation_merge": True,
+        },
+        "courses": {},
+    }
+    path.write_bytes(safe_dump(config, encoding="utf-8"))
+
     try:
         with pytest.raises(ValidationError):
-            Config(config_file=f.name)
+            Config(config_file=str(path))
     finally:
-        os.unlink(f.name)
\ No newline at end of file
+        path.unlink()
\ No newline at end of file
@@ -0,0 +1,66 @@
+"""
+Tests for the course selector module.
+"""
+
+import json
+import os
+
+from thinkiplex.cli.course_selector import CourseRegistry, read_config_cached, save_config
+
+
+def test_save_config_writes_sidecar(temp_dir):
+    """Test that a saved config is read back from its JSON sidecar."""
+    config_path = temp_dir / "thinkiplex.yaml"
+    config = {
+        "global": {"video_quality": "720p"},
+        "courses": {"test-course": {"show_name": "Test Course", "season": "01"}},
+    }
+
+    save_config(config_path, config)
+
+    sidecar = json.loads((temp_dir / "thinkiplex.yaml.json").read_text())
+    assert sidecar["config"] == config
+    assert read_config_cached(config_path) == config
+
+
+def test_sidecar_is_owner_only(temp_dir):
+    """Test that the sidecar holding the parsed config is not world-readable."""
+    config_path = temp_dir / "thinkiplex.yaml"
+    config_path.write_text("global:\n  cookie_data: secret\n")
+    os.chmod(config_path, 0o644)
+
+    assert read_config_cached(config_path) == {"global": {"cookie_data": "secret"}}
+    assert (temp_dir / "thinkiplex.yaml.json").stat().st_mode & 0o777 == 0o600
+
+
+def test_save_config_keeps_mode_and_symlink(temp_dir):
+    """Test that saving writes through a symlink and keeps the file's mode."""
+    real_path = temp_dir / "real.yaml"
+    real_path.write_text("global: {}\n")
+    os.chmod(real_path, 0o600)
+    config_path = temp_dir / "thinkiplex.yaml"
+    config_path.symlink_to(real_path)
+
+    save_config(config_path, {"global": {"video_quality": "720p"}})
+
+    assert config_path.is_symlink()
+    assert real_path.stat().st_mode & 0o777 == 0o600
+    assert read_config_cached(config_path) == {"global": {"video_quality": "720p"}}
+
+
+def test_course_registry_merges_global_defaults(temp_dir):
+    """Test that course settings override the global defaults."""
+    config_path = temp_dir / "thinkiplex.yaml"
+    save_config(
+        config_path,
+        {
+            "global": {"video_quality": "720p", "audio_format": "mp3"},
+            "courses": {"test-course": {"video_quality": "1080p"}},
+        },
+    )
+
+    registry = CourseRegistry(config_path)
+
+    assert registry.names() == ["test-course"]
+    assert registry.get("test-course") == {"video_quality": "1080p", "audio_format": "mp3"}
+    assert registry.get("missing") is None
@@ -0,0 +1,95 @@
+"""
+Tests for the file utilities.
+"""
+
+import os
+
+from thinkiplex.utils.files import (
+    fast_copy,
+    link_or_copy,
+    quote_env_value,
+    unquote_env_value,
+    write_if_changed,
+)
+
+
+def test_write_if_changed_creates_file(temp_dir):
+    """Test writing a file that does not exist yet."""
+    path = temp_dir / ".env"
+
+    assert write_if_changed(path, b"KEY=value\n") is True
+    assert path.read_bytes() == b"KEY=value\n"
+    assert not (temp_dir / ".env.tmp").exists()
+
+
+def test_write_if_changed_skips_identical_content(temp_dir):
+    """Test that identical content is not rewritten."""
+    path = temp_dir / ".env"
+    path.write_bytes(b"KEY=value\n")
+    mtime = path.stat().st_mtime_ns
+
+    assert write_if_changed(path, b"KEY=value\n") is False
+    assert path.stat().st_mtime_ns == mtime
+
+
+def test_write_if_changed_replaces_different_content(temp_dir):
+    """Test that different content replaces the file."""
+    path = temp_dir / ".env"
+    path.write_bytes(b"KEY=old\n")
+
+    assert write_if_changed(path, b"KEY=new\n") is True
+    assert path.read_bytes() == b"KEY=new\n"
+
+
+def test_link_or_copy_stages_file(temp_dir):
+    """Test staging a file into another directory."""
+    src = temp_dir / "course.json"
+    src.write_bytes(b'{"course": {}}')
+    dst_dir = temp_dir / "php"
+    dst_dir.mkdir()
+    dst = dst_dir / "course.json"
+    dst.write_bytes(b"stale")
+
+    link_or_copy(src, dst)
+
+    assert dst.read_bytes() == b'{"course": {}}'
+
+    # Removing the staged copy leaves the source intact
+    dst.unlink()
+    assert src.read_bytes() == b'{"course": {}}'
+
+
+def test_fast_copy_copies_content_and_metadata(temp_dir):
+    """Test copying a file with the fast copy helper."""
+    src = temp_dir / "video.mp4"
+    src.write_bytes(b"x" * 100_000)
+    src.chmod(0o640)
+    os.utime(src, ns=(1_000_000_000, 2_000_000_000))
+    dst = temp_dir / "copy.mp4"
+
+    assert fast_copy(src, dst) == dst
+    assert dst.read_bytes() == src.read_bytes()
+    assert dst.stat().st_mtime_ns == 2_000_000_000
+    assert dst.stat().st_mode & 0o777 == 0o640
+
+
+def test_write_if_changed_sets_mode(temp_dir):
+    """Test that an explicit mode is applied to the written file."""
+    path = temp_dir / ".env"
+    path.write_bytes(b"KEY=old\n")
+    path.chmod(0o644)
+
+    assert write_if_changed(path, b"KEY=secret\n", mode=0o600) is True
+    assert path.read_bytes() == b"KEY=secret\n"
+    assert path.stat().st_mode & 0o777 == 0o600
+
+
+def test_quote_env_value_round_trips():
+    """Test that quoted .env values cannot break out of their line."""
+    value = 'abc"; $HOME \\ `x`\nEVIL=1'
+    quoted = quote_env_value(value)
+
+    assert "\n" not in quoted
+    assert quoted.startswith('"') and quoted.endswith('"')
+    assert unquote_env_value(quoted) == value
+    assert unquote_env_value("'plain'") == "plain"
@@ -45,6 +45,19 @@ def test_copy_to_plex_success(media_processor, temp_dir, setup_test_file):
     assert open(target_path, "r").read() == "test content"
 
 
+def test_copy_to_plex_keeps_mode_and_mtime(media_processor, temp_dir, setup_test_file):
+    """Test that the copy keeps the source's permissions and timestamps."""
+    os.chmod(setup_test_file, 0o640)
+    os.utime(setup_test_file, ns=(1_000_000_000, 2_000_000_000))
+    target_path = temp_dir / "plex" / "test.txt"
+
+    media_processor.copy_to_plex(str(setup_test_file), str(target_path))
+
+    st = os.stat(target_path)
+    assert st.st_mode & 0o777 == 0o640
+    assert st.st_mtime_ns == 2_000_000_000
+
+
 def test_copy_to_plex_failure(media_processor, temp_dir):
     """Test file copy failure."""
     source_path = temp_dir / "nonexistent.txt"
@@ -61,8 +74,8 @@ def test_add_video_metadata_success(mock_run, media_processor, temp_dir, setup_t
     video_path = setup_test_file
     metadata = {"title": "Test Video", "show": "Test Show"}
     
-    # Mock shutil.move to avoid actually moving files
-    with patch("shutil.move") as mock_move:
+    # Mock os.replace to avoid actually moving files
+    with patch("os.replace") as mock_replace:
         result = media_processor.add_video_metadata(str(video_path), metadata)
     
     assert result is True
@@ -111,4 +124,28 @@ def test_extract_audio_failure(mock_run, media_processor, temp_dir, setup_test_f
     
     # Should raise MediaProcessingError
     with pytest.raises(MediaProcessingError):
-        media_processor.extract_audio_from_video(video_path, audio_path, metadata)
\ No newline at end of file
+        media_processor.extract_audio_from_video(video_path, audio_path, metadata)
+
+
+def test_find_video_file_prefers_priority_dirs(media_processor, temp_dir):
+    """Test that videos in watch/playback style directories are found first."""
+    (temp_dir / "extras").mkdir()
+    (temp_dir / "extras" / "teaser.mp4").write_bytes(b"")
+    (temp_dir / "Playback-Lesson").mkdir()
+    (temp_dir / "Playback-Lesson" / "lesson.MKV").write_bytes(b"")
+
+    found = media_processor.find_video_file(str(temp_dir))
+
+    assert found == str(temp_dir / "Playback-Lesson" / "lesson.MKV")
+
+
+def test_copy_to_plex_creates_target_dir_once(media_processor, temp_dir, setup_test_file):
+    """Test that repeat copies into one directory skip makedirs."""
+    target_dir = temp_dir / "Season 01"
+
+    with patch("os.makedirs", wraps=os.makedirs) as mock_makedirs:
+        media_processor.copy_to_plex(str(setup_test_file), str(target_dir / "a.txt"))
+        media_processor.copy_to_plex(str(setup_test_file), str(target_dir / "b.txt"))
+
+    assert mock_makedirs.call_count == 1
+    assert (target_dir / "b.txt").read_text() == "test content"
@@ -0,0 +1,52 @@
+"""
+Tests for the metadata utilities.
+"""
+
+import pytest
+
+from thinkiplex.organizer.metadata import MetadataExtractor
+
+
+@pytest.fixture
+def extractor():
+    """Create a metadata extractor with contents and chapters."""
+    return MetadataExtractor(
+        {
+            "contents": [
+                {"id": 7, "name": "Welcome", "description": "Intro", "position": 2},
+                {"id": 2, "name": "Second", "description": "By id", "position": 5},
+                {"id": 9, "name": "Later", "description": "Duplicate", "position": 2},
+            ],
+            "chapters": [
+                {"position": 3, "name": "Basics", "description": "Chapter three"},
+            ],
+        }
+    )
+
+
+def test_extract_from_course_data_first_match_wins(extractor):
+    """Test that the earliest content matching by id or position is used."""
+    assert extractor.extract_from_course_data(2) == ("Welcome", "Intro")
+    assert extractor.extract_from_course_data(5) == ("Second", "By id")
+    assert extractor.extract_from_course_data(9) == ("Later", "Duplicate")
+
+
+def test_extract_from_course_data_falls_back_to_chapters(extractor):
+    """Test chapter lookup and the not-found case."""
+    assert extractor.extract_from_course_data(3) == ("Basics", "Chapter three")
+    assert extractor.extract_from_course_data(42) == (None, None)
+    assert MetadataExtractor().extract_from_course_data(1) == (None, None)
+
+
+@pytest.mark.parametrize(
+    "dir_name, expected",
+    [
+        ("4. weekly-live-call", "Live session 4 focusing on weekly live call"),
+        ("4. ear-workshop", "Workshop session 4 with practical exercises on ear workshop"),
+        ("4. scale-practice", "Practice session 4 with guided exercises related to scale practice"),
+        ("4. theory-basics", "Episode 4: Theory Basics"),
+    ],
+)
+def test_get_episode_description_generated(dir_name, expected):
+    """Test generic descriptions chosen from the directory name."""
+    assert MetadataExtractor().get_episode_description(4, dir_name) == expected
@@ -38,7 +38,7 @@ def test_parallel_map_with_errors():
     results = parallel_map(work_func, items, max_workers=2)
     
     # Only odd numbers should have been processed successfully
-    assert 2 not in results
+    assert 4 not in results
     assert 8 not in results
     assert 2 in results
     assert 6 in results
@@ -56,4 +56,29 @@ def test_parallel_map_timeout():
     
     # Should complete successfully but with no results due to timeout
     with pytest.raises(TimeoutError):
-        parallel_map(slow_func, items, max_workers=2, timeout=0.5)
\ No newline at end of file
+        parallel_map(slow_func, items, max_workers=2, timeout=0.5)
+
+
+def _square(x):
+    """Module-level worker so it can be pickled for process pools."""
+    return x * x
+
+
+def test_parallel_map_process_mode():
+    """Test parallel_map with a process pool."""
+    results = parallel_map(_square, [1, 2, 3], max_workers=2, mode="process")
+
+    assert results == [1, 4, 9]
+
+
+def test_parallel_map_auto_mode_falls_back_to_threads():
+    """Test that auto mode uses threads for functions that cannot be pickled."""
+    results = parallel_map(lambda x: x + 1, [1, 2, 3], max_workers=2, mode="auto")
+
+    assert results == [2, 3, 4]
+
+
+def test_parallel_map_invalid_mode():
+    """Test parallel_map with an unknown mode."""
+    with pytest.raises(ValueError):
+        parallel_map(_square, [1], mode="fiber")
@@ -0,0 +1,327 @@
+"""
+Tests for the PHP downloader wrapper.
+"""
+
+import copy
+import json
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from thinkiplex.downloader import php_wrapper
+from thinkiplex.downloader.php_wrapper import PHPDownloader, _php_available
+
+
+@pytest.fixture
+def downloader(temp_dir):
+    """Create a PHP downloader rooted in a temporary directory."""
+    return PHPDownloader(temp_dir)
+
+
+def test_php_available_is_cached(downloader):
+    """Test that the PHP probe runs once until the cache is invalidated."""
+    downloader.invalidate_php_cache()
+    with patch("shutil.which", return_value="/usr/bin/php") as mock_which:
+        assert _php_available() is True
+        assert _php_available() is True
+        assert mock_which.call_count == 1
+
+        downloader.invalidate_php_cache()
+        assert _php_available() is True
+        assert mock_which.call_count == 2
+    downloader.invalidate_php_cache()
+
+
+def test_download_selective_requires_docker_not_php(downloader, temp_dir):
+    """Test that selective downloads check for Docker, which runs PHP for them."""
+    json_file = temp_dir / "course.json"
+    json_file.write_text("{}")
+
+    downloader.invalidate_php_cache()
+    with patch("shutil.which", side_effect=lambda name: None) as mock_which:
+        assert downloader.download_selective(json_file) is False
+    mock_which.assert_called_once_with("docker")
+    downloader.invalidate_php_cache()
+
+
+def test_run_php_for_course_leaves_cwd_alone(downloader):
+    """Test that the PHP child runs in the course directory via cwd=, not chdir."""
+    cwd = os.getcwd()
+    downloader.invalidate_php_cache()
+    with patch("shutil.which", return_value="/opt/php/bin/php"), patch(
+        "subprocess.run"
+    ) as mock_run:
+        assert downloader._run_php_for_course(
+            "test-course", "https://x.thinkific.com/courses/take/test-course", "", "", "720p"
+        )
+
+    assert os.getcwd() == cwd
+    assert mock_run.call_args.kwargs["cwd"] == downloader.php_dir / "test-course"
+    assert mock_run.call_args.kwargs["env"]["VIDEO_DOWNLOAD_QUALITY"] == "720p"
+    assert mock_run.call_args.args[0][:2] == ["/opt/php/bin/php", str(downloader.php_script)]
+    downloader.invalidate_php_cache()
+
+
+def test_download_courses_keeps_job_order(downloader):
+    """Test that concurrent downloads return one result per job, in order."""
+    jobs = [
+        {"course_link": "https://example.thinkific.com/courses/take/ok"},
+        {"course_link": "https://example.thinkific.com/courses/take/fails"},
+        {"course_link": "https://example.thinkific.com/courses/take/raises"},
+    ]
+
+    def fake_download(course_link, **kwargs):
+        if course_link.endswith("raises"):
+            raise RuntimeError("boom")
+        return course_link.endswith("ok")
+
+    with patch.object(downloader, "download_course", side_effect=fake_download):
+        assert downloader.download_courses(jobs) == [True, False, False]
+
+
+def test_download_courses_isolates_tracking(downloader, temp_dir):
+    """Test that concurrent downloads each keep their own tracking file."""
+    downloader.php_script.parent.mkdir(parents=True, exist_ok=True)
+    downloader.php_script.write_text("<?php")
+    started = threading.Barrier(2, timeout=5)
+
+    def fake_php(cmd, cwd, **kwargs):
+        # Both jobs are running before either writes its tracking file
+        started.wait()
+        (cwd / ".download_tracking").write_text(json.dumps({cwd.name: True}))
+
+    jobs = [
+        {"course_link": "https://example.thinkific.com/courses/take/one"},
+        {"course_link": "https://example.thinkific.com/courses/take/two"},
+    ]
+    downloader.invalidate_php_cache()
+    with patch("shutil.which", return_value="/usr/bin/php"), patch(
+        "subprocess.run", side_effect=fake_php
+    ):
+        assert downloader.download_courses(jobs, max_workers=2) == [True, True]
+    downloader.invalidate_php_cache()
+
+    for name in ("one", "two"):
+        tracking_file = downloader._downloads_dir(name) / ".download_tracking"
+        assert json.loads(tracking_file.read_text()) == {name: True}
+    assert not (downloader.php_dir / ".download_tracking").exists()
+
+
+def test_move_downloaded_course(downloader, temp_dir):
+    """Test moving a finished download into the course's downloads directory."""
+    php_course_dir = downloader.php_dir / "test-course"
+    (php_course_dir / "01. Intro").mkdir(parents=True)
+    (php_course_dir / "01. Intro" / "video.mp4").write_bytes(b"new video")
+    (php_course_dir / "test-course.json").write_text("{}")
+    (php_course_dir / ".download_tracking").write_text(json.dumps({"b": 2}))
+
+    downloads_dir = temp_dir / "data" / "courses" / "test-course" / "downloads"
+    (downloads_dir / "01. Intro").mkdir(parents=True)
+    (downloads_dir / "01. Intro" / "notes.pdf").write_bytes(b"old notes")
+    (downloads_dir / ".download_tracking").write_text(json.dumps({"a": 1}))
+
+    downloader._move_downloaded_course("test-course")
+
+    assert not php_course_dir.exists()
+    assert (downloads_dir / "01. Intro" / "video.mp4").read_bytes() == b"new video"
+    assert (downloads_dir / "01. Intro" / "notes.pdf").read_bytes() == b"old notes"
+    assert (downloads_dir / "test-course.json").read_text() == "{}"
+    assert json.loads((downloads_dir / ".download_tracking").read_text()) == {"a": 1, "b": 2}
+
+
+def test_move_downloaded_course_new_tracking_file(downloader, temp_dir):
+    """Test that a tracking file with nothing to merge into is carried over."""
+    php_course_dir = downloader.php_dir / "test-course"
+    php_course_dir.mkdir(parents=True)
+    (php_course_dir / ".download_tracking").write_text(json.dumps({"b": 2}))
+
+    downloader._move_downloaded_course("test-course")
+
+    downloads_dir = temp_dir / "data" / "courses" / "test-course" / "downloads"
+    assert not php_course_dir.exists()
+    assert json.loads((downloads_dir / ".download_tracking").read_text()) == {"b": 2}
+
+
+def test_move_downloaded_course_first_download(downloader, temp_dir):
+    """Test that a course with no downloads directory yet is renamed in one step."""
+    php_course_dir = downloader.php_dir / "test-course"
+    (php_course_dir / "01. Intro").mkdir(parents=True)
+    (php_course_dir / "01. Intro" / "video.mp4").write_bytes(b"video")
+    (php_course_dir / ".download_tracking").write_text(json.dumps({"b": 2}))
+
+    with patch("thinkiplex.downloader.php_wrapper._move_into") as mock_move_into:
+        downloader._move_downloaded_course("test-course")
+
+    downloads_dir = temp_dir / "data" / "courses" / "test-course" / "downloads"
+    mock_move_into.assert_not_called()
+    assert not php_course_dir.exists()
+    assert (downloads_dir / "01. Intro" / "video.mp4").read_bytes() == b"video"
+    assert json.loads((downloads_dir / ".download_tracking").read_text()) == {"b": 2}
+
+
+def test_move_downloaded_course_keeps_source_on_failure(downloader):
+    """Test that a failed move leaves the PHP copy of the course in place."""
+    php_course_dir = downloader.php_dir / "test-course"
+    php_course_dir.mkdir(parents=True)
+    (php_course_dir / "a.mp4").write_bytes(b"a")
+    (php_course_dir / "b.mp4").write_bytes(b"b")
+    downloader._downloads_dir("test-course").mkdir(parents=True)
+
+    with patch(
+        "thinkiplex.downloader.php_wrapper._move_into", side_effect=OSError("disk full")
+    ):
+        with pytest.raises(OSError):
+            downloader._move_downloaded_course("test-course")
+
+    assert (php_course_dir / "a.mp4").exists()
+
+
+def test_move_downloaded_course_failure_keeps_tracking_separate(downloader):
+    """Test that re-staging after a failed move doesn't clobber the tracking file."""
+    php_course_dir = downloader.php_dir / "test-course"
+    php_course_dir.mkdir(parents=True)
+    (php_course_dir / "a.mp4").write_bytes(b"a")
+    (php_course_dir / ".download_tracking").write_text(json.dumps({"b": 2}))
+    downloads_dir = downloader._downloads_dir("test-course")
+    downloads_dir.mkdir(parents=True)
+
+    real_move_into = php_wrapper._move_into
+
+    def move_into(src, dest):
+        if src.suffix == ".mp4":
+            raise OSError("disk full")
+        real_move_into(src, dest)
+
+    with patch("thinkiplex.downloader.php_wrapper._move_into", side_effect=move_into):
+        with pytest.raises(OSError):
+            downloader._move_downloaded_course("test-course")
+
+    tracking_file = downloads_dir / ".download_tracking"
+    assert not (php_course_dir / ".download_tracking").exists()
+
+    downloader._stage_tracking_file(downloads_dir, php_course_dir)
+    staged = php_course_dir / ".download_tracking"
+    assert not os.path.samefile(tracking_file, staged)
+    staged.write_text("")
+
+    assert json.loads(tracking_file.read_text()) == {"b": 2}
+
+
+def test_load_tracking_detects_same_mtime_rewrite(temp_dir):
+    """Test that a tracking file rewritten with the same mtime is re-read."""
+    path = temp_dir / ".download_tracking"
+    path.write_text(json.dumps({"a": 1}))
+    st = os.stat(path)
+    assert php_wrapper._load_tracking(path) == {"a": 1}
+
+    path.write_text(json.dumps({"a": 1, "b": 2}))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    assert php_wrapper._load_tracking(path) == {"a": 1, "b": 2}
+
+
+def test_tracking_cache_is_bounded(temp_dir):
+    """Test that the tracking cache evicts its least recently used entries."""
+    with patch.object(php_wrapper, "_TRACKING_CACHE_SIZE", 2):
+        paths = [temp_dir / f"{i}.tracking" for i in range(3)]
+        for path in paths:
+            php_wrapper._write_tracking(path, {})
+
+        assert str(paths[0]) not in php_wrapper._TRACKING_CACHE
+        assert len(php_wrapper._TRACKING_CACHE) <= 2
+
+
+@pytest.fixture
+def course_data():
+    """Create course data with two chapters."""
+    return {
+        "chapters": [
+            {
+                "id": 1,
+                "title": "Intro",
+                "lessons": [{"id": 10, "title": "Welcome", "updated_at": "2024-01-01"}],
+            },
+            {
+                "id": 2,
+                "title": "Basics",
+                "lessons": [{"id": 20, "title": "Setup", "updated_at": "2024-01-01"}],
+            },
+        ]
+    }
+
+
+def test_compare_course_data_unchanged(downloader, course_data):
+    """Test that identical course data reports no updates."""
+    assert downloader._compare_course_data(course_data, copy.deepcopy(course_data)) is False
+
+
+def test_compare_course_data_ignores_other_fields(downloader, course_data):
+    """Test that changes outside ids and updated_at, or removals, are not updates."""
+    renamed = copy.deepcopy(course_data)
+    renamed["chapters"][0]["title"] = "Introduction"
+    renamed["chapters"][0]["lessons"][0]["video_url"] = "https://cdn.example.com/signed"
+    assert downloader._compare_course_data(course_data, renamed) is False
+
+    removed = copy.deepcopy(course_data)
+    del removed["chapters"][1]
+    assert downloader._compare_course_data(course_data, removed) is False
+
+
+def test_compare_course_data_detects_changes(downloader, course_data):
+    """Test detecting new chapters, new lessons and updated lessons."""
+    new_chapter = copy.deepcopy(course_data)
+    new_chapter["chapters"].append({"id": 3, "title": "Advanced", "lessons": []})
+    assert downloader._compare_course_data(course_data, new_chapter) is True
+
+    new_lesson = copy.deepcopy(course_data)
+    new_lesson["chapters"][1]["lessons"].append({"id": 21, "title": "Next"})
+    assert downloader._compare_course_data(course_data, new_lesson) is True
+
+    updated = copy.deepcopy(course_data)
+    updated["chapters"][0]["lessons"][0]["updated_at"] = "2024-02-01"
+    assert downloader._compare_course_data(course_data, updated) is True
+
+
+def test_get_course_data_falls_back_to_downloads(downloader, temp_dir):
+    """Test finding course data in the downloads directory."""
+    downloads_dir = temp_dir / "data" / "courses" / "test-course" / "downloads"
+    downloads_dir.mkdir(parents=True)
+    (downloads_dir / "video.mp4").write_bytes(b"")
+    (downloads_dir / "export.json").write_text(json.dumps({"course": {"slug": "test-course"}}))
+
+    assert downloader.get_course_data("test-course") == {"course": {"slug": "test-course"}}
+    assert downloader.get_course_data("missing-course") == {}
+
+
+def test_get_course_data_remembers_found_file(downloader, temp_dir):
+    """Test that the directory scan for course data is skipped on repeat calls."""
+    downloads_dir = temp_dir / "data" / "courses" / "test-course" / "downloads"
+    downloads_dir.mkdir(parents=True)
+    (downloads_dir / "export.json").write_text(json.dumps({"chapters": []}))
+
+    with patch(
+        "thinkiplex.downloader.php_wrapper._find_json_file",
+        wraps=php_wrapper._find_json_file,
+    ) as mock_find:
+        downloader.get_course_data("test-course")
+        scans = mock_find.call_count
+        downloader.get_course_data("test-course")
+        assert mock_find.call_count == scans + 1  # only the empty course directory
+
+        (downloads_dir / "export.json").unlink()
+        assert downloader.get_course_data("test-course") == {}
+
+
+def test_get_course_data_reloads_changed_file(downloader, temp_dir):
+    """Test that cached course data is refreshed when the file changes."""
+    json_file = temp_dir / "data" / "courses" / "test-course" / "test-course.json"
+    json_file.parent.mkdir(parents=True)
+    json_file.write_text(json.dumps({"chapters": []}))
+
+    first = downloader.get_course_data("test-course")
+    assert downloader.get_course_data("test-course") is first
+
+    json_file.write_text(json.dumps({"chapters": [{"id": 1}]}))
+    assert downloader.get_course_data("test-course") == {"chapters": [{"id": 1}]}
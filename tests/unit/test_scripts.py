@@ -0,0 +1,22 @@
+"""
+Tests for the scripts module.
+"""
+
+from thinkiplex.cli.scripts import course_status
+
+
+def test_course_status(temp_dir):
+    """Test detecting downloaded and organized courses in one pass."""
+    course_dir = temp_dir / "test-course"
+
+    assert course_status(course_dir) == (False, False, False)
+
+    (course_dir / "downloads").mkdir(parents=True)
+    (course_dir / "plex").mkdir()
+    assert course_status(course_dir) == (True, False, False)
+
+    (course_dir / "downloads" / "video.mp4").touch()
+    assert course_status(course_dir) == (True, True, False)
+
+    (course_dir / "plex" / "Season 01").mkdir()
+    assert course_status(course_dir) == (True, True, True)
@@ -4,12 +4,23 @@ ThinkiPlex - A comprehensive tool for downloading and organizing Thinkific cours
 This package provides tools to download Thinkific courses and organize them for Plex media server.
 """
 
+import importlib
+from typing import Any, List
+
 __version__ = "0.2.0"
 
-from .cli import main
-from .downloader import PHPDownloader
-from .organizer import CourseOrganizer, MediaProcessor, MetadataExtractor
-from .utils import Config, get_logger, setup_logging
+# Public names and the submodules that provide them. They are imported on first
+# access (PEP 562) so that `import thinkiplex` stays cheap for small commands.
+_LAZY = {
+    "main": ".cli",
+    "PHPDownloader": ".downloader",
+    "CourseOrganizer": ".organizer",
+    "MetadataExtractor": ".organizer",
+    "MediaProcessor": ".organizer",
+    "Config": ".utils",
+    "setup_logging": ".utils",
+    "get_logger": ".utils",
+}
 
 __all__ = [
     "main",
@@ -21,3 +32,16 @@ __all__ = [
     "setup_logging",
     "get_logger",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        module = importlib.import_module(_LAZY[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + list(_LAZY))
@@ -7,11 +7,56 @@ This module provides functions to clean up and consolidate the data structure.
 import logging
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import List, Set, Tuple
+
+from thinkiplex.utils.files import fast_copy
 
 logger = logging.getLogger(__name__)
 
 
+def _transfer(src: Path, dest: Path, rename: bool, is_dir: bool) -> None:
+    """
+    Move or copy a file or directory into the consolidated layout.
+
+    When renaming is allowed (the source is being moved and shares a filesystem
+    with the destination) and the destination does not exist yet, the item is
+    renamed in place instead of copying its contents.
+
+    Args:
+        src: Source file or directory
+        dest: Destination path
+        rename: Whether src may be renamed into place
+        is_dir: Whether src is a directory
+    """
+    if rename and not dest.exists():
+        os.rename(src, dest)
+    elif is_dir:
+        shutil.copytree(src, dest, copy_function=fast_copy, dirs_exist_ok=True)
+    else:
+        fast_copy(src, dest)
+
+
+def _transfer_all(transfers: List[Tuple[Path, Path, bool, bool]]) -> None:
+    """
+    Run a batch of transfers concurrently.
+
+    Transfers target distinct destinations, so they can run on a thread pool;
+    the copy syscalls release the GIL and let threads scale with disk bandwidth.
+
+    Args:
+        transfers: List of (src, dest, rename, is_dir) tuples
+    """
+    if not transfers:
+        return
+
+    max_workers = min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Consume the iterator so that any worker exception is re-raised here
+        list(executor.map(lambda t: _transfer(*t), transfers))
+
+
 def consolidate_data_structure() -> bool:
     """
     Consolidate the data structure by moving everything to data/courses.
@@ -21,6 +66,13 @@ def consolidate_data_structure() -> bool:
     """
     logger.info("Consolidating data structure...")
 
+    # Ask up front whether the old directories should go, so that a move can
+    # rename items into place instead of copying them and deleting afterwards
+    print("\nAll data will be consolidated into the data/courses directory.")
+    print("Would you like to remove the old data/downloads and data/plex directories?")
+    response = input("Enter 'y' to remove, any other key to keep them: ")
+    remove_old = response.lower() == "y"
+
     # Get the base directory
     base_dir = Path.cwd()
 
@@ -29,83 +81,105 @@ def consolidate_data_structure() -> bool:
     downloads_dir = base_dir / "data" / "downloads"
     plex_dir = base_dir / "data" / "plex"
 
+    # Directories already created during this run, to skip redundant mkdir calls
+    created: Set[Path] = set()
+
+    def makedirs(path: Path) -> None:
+        if path not in created:
+            os.makedirs(path, exist_ok=True)
+            created.add(path)
+
     # Create the courses directory if it doesn't exist
-    os.makedirs(courses_dir, exist_ok=True)
+    makedirs(courses_dir)
 
     # Process downloads directory
     if downloads_dir.exists():
         logger.info("Processing downloads directory...")
-        for item in downloads_dir.iterdir():
-            if item.is_dir():
-                course_name = item.name
-                course_dir = courses_dir / course_name
-                course_downloads_dir = course_dir / "downloads"
-
-                # Create the course directory if it doesn't exist
-                os.makedirs(course_dir, exist_ok=True)
-                os.makedirs(course_downloads_dir, exist_ok=True)
-
-                logger.info(f"Moving {course_name} downloads to {course_downloads_dir}")
-
-                # Copy the course files
-                for subitem in item.iterdir():
-                    if subitem.is_dir():
-                        # Copy directory
-                        shutil.copytree(
-                            subitem,
+        rename = remove_old and downloads_dir.stat().st_dev == courses_dir.stat().st_dev
+        transfers: List[Tuple[Path, Path, bool, bool]] = []
+        with os.scandir(downloads_dir) as it:
+            course_entries = [entry for entry in it if entry.is_dir(follow_symlinks=False)]
+        for item in course_entries:
+            course_name = item.name
+            course_dir = courses_dir / course_name
+            course_downloads_dir = course_dir / "downloads"
+
+            # Create the course directory if it doesn't exist
+            makedirs(course_dir)
+            makedirs(course_downloads_dir)
+
+            logger.info(f"Moving {course_name} downloads to {course_downloads_dir}")
+
+            # Queue the course files for moving or copying
+            with os.scandir(item.path) as entries:
+                for subitem in entries:
+                    transfers.append(
+                        (
+                            Path(subitem.path),
                             course_downloads_dir / subitem.name,
-                            dirs_exist_ok=True,
+                            rename,
+                            subitem.is_dir(),
                         )
-                    else:
-                        # Copy file
-                        shutil.copy2(subitem, course_downloads_dir / subitem.name)
+                    )
+
+        _transfer_all(transfers)
 
     # Process plex directory
     if plex_dir.exists():
         logger.info("Processing plex directory...")
-        for item in plex_dir.iterdir():
-            if item.is_dir():
-                course_name = item.name
-                course_dir = courses_dir / course_name
-                course_plex_dir = course_dir / "plex"
-
-                # Create the course directory if it doesn't exist
-                os.makedirs(course_dir, exist_ok=True)
-                os.makedirs(course_plex_dir, exist_ok=True)
-
-                logger.info(f"Moving {course_name} plex content to {course_plex_dir}")
-
-                # Copy the course files
-                for subitem in item.iterdir():
-                    if subitem.is_dir():
-                        # Copy directory
-                        shutil.copytree(
-                            subitem, course_plex_dir / subitem.name, dirs_exist_ok=True
+        rename = remove_old and plex_dir.stat().st_dev == courses_dir.stat().st_dev
+        transfers = []
+        with os.scandir(plex_dir) as it:
+            course_entries = [entry for entry in it if entry.is_dir(follow_symlinks=False)]
+        for item in course_entries:
+            course_name = item.name
+            course_dir = courses_dir / course_name
+            course_plex_dir = course_dir / "plex"
+
+            # Create the course directory if it doesn't exist
+            makedirs(course_dir)
+            makedirs(course_plex_dir)
+
+            logger.info(f"Moving {course_name} plex content to {course_plex_dir}")
+
+            # Queue the course files for moving or copying
+            with os.scandir(item.path) as entries:
+                for subitem in entries:
+                    transfers.append(
+                        (
+                            Path(subitem.path),
+                            course_plex_dir / subitem.name,
+                            rename,
+                            subitem.is_dir(),
                         )
-                    else:
-                        # Copy file
-                        shutil.copy2(subitem, course_plex_dir / subitem.name)
+                    )
+
+        _transfer_all(transfers)
 
     # Process JSON files in the courses directory
-    for item in courses_dir.glob("*.json"):
-        if item.is_file():
-            course_name = item.stem
-            course_dir = courses_dir / course_name
+    with os.scandir(courses_dir) as it:
+        json_items = [
+            entry for entry in it if entry.is_file() and entry.name.endswith(".json")
+        ]
 
-            # Create the course directory if it doesn't exist
-            os.makedirs(course_dir, exist_ok=True)
+    for item in json_items:
+        course_name = os.path.splitext(item.name)[0]
+        course_dir = courses_dir / course_name
 
-            logger.info(f"Moving {item.name} to {course_dir}")
+        # Create the course directory if it doesn't exist
+        makedirs(course_dir)
 
-            # Copy the JSON file
-            shutil.copy2(item, course_dir / item.name)
+        logger.info(f"Moving {item.name} to {course_dir}")
+
+        # Move or copy the JSON file
+        if remove_old:
+            os.replace(item.path, course_dir / item.name)
+        else:
+            fast_copy(item.path, course_dir / item.name)
 
-    # Ask if we should remove the old directories
     print("\nAll data has been consolidated into the data/courses directory.")
-    print("Would you like to remove the old data/downloads and data/plex directories?")
-    response = input("Enter 'y' to remove, any other key to keep them: ")
 
-    if response.lower() == "y":
+    if remove_old:
         logger.info("Removing old directories...")
 
         # Remove the downloads directory
@@ -118,12 +192,6 @@ def consolidate_data_structure() -> bool:
             shutil.rmtree(plex_dir)
             logger.info(f"Removed {plex_dir}")
 
-        # Remove JSON files in the courses directory
-        for item in courses_dir.glob("*.json"):
-            if item.is_file():
-                os.remove(item)
-                logger.info(f"Removed {item}")
-
         print("Old directories and files removed.")
     else:
         print("Old directories and files kept.")
@@ -4,56 +4,252 @@ Course Selector Module
 This module provides functionality to interactively select a course to process.
 """
 
+import functools
+import hashlib
+import json
 import logging
+import os
+import threading
+from collections import ChainMap
 from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Tuple, cast
 
-import yaml
+from thinkiplex.utils._yaml import safe_dump, safe_load
+from thinkiplex.utils.files import write_if_changed
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_CONFIG = Path("config/thinkiplex.yaml")
 
-def get_available_courses(config_path=None):
+# Parsed configuration per path, with the (mtime, size, inode) signature it was
+# read at, so repeated lookups in the same process skip the read and the parse
+# until the file changes on disk (including being replaced by a rename)
+_YAML_CACHE: Dict[str, Tuple[Tuple[int, int, int], Dict[str, Any]]] = {}
+_YAML_CACHE_LOCK = threading.Lock()
+
+
+def _load_yaml_cached(config_path: Path) -> Dict[str, Any]:
+    """
+    Load a YAML configuration file through its on-disk JSON sidecar.
+
+    The sidecar (``<config>.json``) stores the SHA-256 of the YAML bytes next to
+    the parsed result, so later runs read it with the JSON parser instead of
+    parsing YAML while the file's content is unchanged.
+
+    Args:
+        config_path: Path to the configuration file.
+
+    Returns:
+        The parsed configuration.
+    """
+    data = config_path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    sidecar_path = config_path.with_name(config_path.name + ".json")
+
+    try:
+        cached = json.loads(sidecar_path.read_bytes())
+        if cached.get("sha256") == digest:
+            return cast(Dict[str, Any], cached["config"])
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
+
+    config = cast(Dict[str, Any], safe_load(data) or {})
+    _write_sidecar(sidecar_path, digest, config)
+    return config
+
+
+def _write_sidecar(sidecar_path: Path, digest: str, config: Dict[str, Any]) -> None:
+    """
+    Atomically write the JSON sidecar for a configuration file.
+
+    Failing to write it only costs a YAML parse next time. Configs that JSON
+    cannot represent faithfully (YAML dates, non-string keys) are not cached.
+    The sidecar holds the same cookie data as the config, so only the owner
+    may read it.
+
+    Args:
+        sidecar_path: Path of the sidecar file.
+        digest: SHA-256 of the YAML bytes the config was parsed from.
+        config: The parsed configuration.
+    """
+    try:
+        payload = json.dumps({"sha256": digest, "config": config})
+        if json.loads(payload)["config"] == config:
+            write_if_changed(sidecar_path, payload.encode(), mode=0o600)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f"Could not write configuration cache {sidecar_path}: {e}")
+
+
+def read_config_cached(config_path: Path) -> Dict[str, Any]:
+    """
+    Load a YAML configuration file, reusing the parsed result while unchanged.
+
+    Args:
+        config_path: Path to the configuration file.
+
+    Returns:
+        The parsed configuration. It is shared between callers and must be
+        treated as read-only.
+    """
+    st = os.stat(config_path)
+    signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+    key = str(config_path)
+
+    with _YAML_CACHE_LOCK:
+        cached = _YAML_CACHE.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        config = _load_yaml_cached(config_path)
+        _YAML_CACHE[key] = (signature, config)
+        return config
+
+
+def save_config(config_path: Path, config: Dict[str, Any]) -> None:
+    """
+    Write a YAML configuration file together with its JSON sidecar.
+
+    The caller already holds the parsed form, so the sidecar is written here.
+    The next read_config_cached() in a fresh process then skips the YAML
+    parse entirely. A symlinked config is written through the link, and an
+    existing file keeps its permissions.
+
+    Args:
+        config_path: Path to the configuration file.
+        config: The configuration to save.
+    """
+    data = safe_dump(config, default_flow_style=False, sort_keys=False).encode()
+    target = config_path.resolve()
+    try:
+        mode: Optional[int] = os.stat(target).st_mode & 0o777
+    except FileNotFoundError:
+        mode = None
+    write_if_changed(target, data, mode=mode)
+    _write_sidecar(
+        config_path.with_name(config_path.name + ".json"),
+        hashlib.sha256(data).hexdigest(),
+        config,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _inquirer() -> ModuleType:
+    """
+    Import inquirer on first use and reuse the module afterwards.
+
+    Returns:
+        The inquirer module.
+
+    Raises:
+        ImportError: If inquirer is not installed.
+    """
+    import inquirer
+
+    return cast(ModuleType, inquirer)
+
+
+class CourseRegistry:
+    """
+    Course configuration parsed once and shared across the CLI helpers.
+
+    Construct one at CLI entry and pass it as ``registry=`` to the functions in
+    this module so they all read from the same parse.
+    """
+
+    def __init__(self, config_path: Optional[Path] = None):
+        """
+        Load the course configuration.
+
+        Args:
+            config_path: Path to the configuration file. If None, uses the default.
+        """
+        if config_path is None:
+            config_path = _DEFAULT_CONFIG
+
+        self.config_path = config_path
+        self.global_cfg: Dict[str, Any] = {}
+        self.courses: Dict[str, Dict[str, Any]] = {}
+
+        if not config_path.exists():
+            return
+
+        try:
+            config = read_config_cached(config_path)
+        except Exception as e:
+            logger.error(f"Error loading configuration: {e}")
+            return
+
+        self.global_cfg = config.get("global") or {}
+        self.courses = config.get("courses") or {}
+
+    def exists(self) -> bool:
+        """Return True if the configuration file exists."""
+        return self.config_path.exists()
+
+    def names(self) -> List[str]:
+        """
+        Get the names of the configured courses.
+
+        Returns:
+            A list of course names.
+        """
+        return list(self.courses)
+
+    def get(self, course_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the configuration for a course merged over the global defaults.
+
+        Args:
+            course_name: Name of the course.
+
+        Returns:
+            A dictionary with the course configuration or None if not found.
+        """
+        if course_name not in self.courses:
+            return None
+
+        # Merge global defaults with course-specific settings; course keys win
+        return dict(ChainMap(self.courses[course_name], self.global_cfg))
+
+
+def get_available_courses(config_path=None, registry=None):
     """
     Get a list of available courses from the configuration file.
 
     Args:
         config_path: Path to the configuration file. If None, uses the default.
+        registry: Preloaded CourseRegistry to read from instead of config_path.
 
     Returns:
         A list of course names.
     """
-    if config_path is None:
-        config_path = Path("config/thinkiplex.yaml")
+    if registry is None:
+        registry = CourseRegistry(config_path)
 
-    if not config_path.exists():
-        logger.warning(f"Configuration file not found: {config_path}")
+    if not registry.exists():
+        logger.warning(f"Configuration file not found: {registry.config_path}")
         return []
 
-    try:
-        with open(config_path, "r") as f:
-            config = yaml.safe_load(f)
-
-        if not config or "courses" not in config:
-            logger.warning("No courses found in configuration file")
-            return []
+    courses = registry.names()
+    if not courses:
+        logger.warning("No courses found in configuration file")
 
-        return list(config["courses"].keys())
-    except Exception as e:
-        logger.error(f"Error loading configuration: {e}")
-        return []
+    return courses
 
 
-def select_course_interactive(config_path=None):
+def select_course_interactive(config_path=None, registry=None):
     """
     Interactively select a course to process.
 
     Args:
         config_path: Path to the configuration file. If None, uses the default.
+        registry: Preloaded CourseRegistry to read from instead of config_path.
 
     Returns:
         The selected course name or None if no selection was made.
     """
-    courses = get_available_courses(config_path)
+    courses = get_available_courses(config_path, registry=registry)
 
     if not courses:
         print("No courses found. Please run the setup wizard first.")
@@ -61,7 +257,7 @@ def select_course_interactive(config_path=None):
 
     # Try to use inquirer for a nice UI if available
     try:
-        import inquirer
+        inquirer = _inquirer()
 
         questions = [
             inquirer.List(
@@ -93,77 +289,60 @@ def select_course_interactive(config_path=None):
                 print("Please enter a valid number")
 
 
-def get_course_config(course_name, config_path=None):
+def get_course_config(course_name, config_path=None, registry=None):
     """
     Get the configuration for a specific course.
 
     Args:
         course_name: Name of the course.
         config_path: Path to the configuration file. If None, uses the default.
+        registry: Preloaded CourseRegistry to read from instead of config_path.
 
     Returns:
         A dictionary with the course configuration or None if not found.
     """
-    if config_path is None:
-        config_path = Path("config/thinkiplex.yaml")
+    if registry is None:
+        registry = CourseRegistry(config_path)
 
-    if not config_path.exists():
-        logger.warning(f"Configuration file not found: {config_path}")
+    if not registry.exists():
+        logger.warning(f"Configuration file not found: {registry.config_path}")
         return None
 
-    try:
-        with open(config_path, "r") as f:
-            config = yaml.safe_load(f)
-
-        if (
-            not config
-            or "courses" not in config
-            or course_name not in config["courses"]
-        ):
-            logger.warning(f"Course not found in configuration: {course_name}")
-            return None
-
-        # Merge global defaults with course-specific settings
-        course_config = config["courses"][course_name].copy()
-
-        # Add global settings as defaults if not specified in course
-        for key, value in config["global"].items():
-            if key not in course_config:
-                course_config[key] = value
+    course_config = registry.get(course_name)
+    if course_config is None:
+        logger.warning(f"Course not found in configuration: {course_name}")
 
-        return course_config
-    except Exception as e:
-        logger.error(f"Error loading configuration: {e}")
-        return None
+    return course_config
 
 
-def load_config(course_name=None, config_path=None):
+def load_config(course_name=None, config_path=None, registry=None):
     """
     Load the configuration for a course or prompt the user to select one.
 
     Args:
         course_name: Name of the course. If None, prompts the user to select one.
         config_path: Path to the configuration file. If None, uses the default.
+        registry: Preloaded CourseRegistry to read from instead of config_path.
 
     Returns:
         A tuple of (course_name, course_config) or (None, None) if no selection was made.
     """
-    if config_path is None:
-        config_path = Path("config/thinkiplex.yaml")
+    if registry is None:
+        registry = CourseRegistry(config_path)
 
-    if not config_path.exists():
-        logger.warning(f"Configuration file not found: {config_path}")
-        print(f"Configuration file not found: {config_path}")
+    if not registry.exists():
+        logger.warning(f"Configuration file not found: {registry.config_path}")
+        print(f"Configuration file not found: {registry.config_path}")
         print("Please run the setup wizard first.")
         return None, None
 
     # If no course name provided, prompt the user to select one
     if course_name is None:
-        course_name = select_course_interactive(config_path)
+        course_name = select_course_interactive(registry=registry)
         if course_name is None:
             return None, None
 
-    course_config = get_course_config(course_name, config_path)
+    course_config = get_course_config(course_name, registry=registry)
     if course_config is None:
         logger.warning(f"Course not found in configuration: {course_name}")
         print(f"Course not found in configuration: {course_name}")
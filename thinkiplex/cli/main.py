@@ -7,23 +7,39 @@ This module provides the command-line interface for ThinkiPlex.
 import argparse
 import logging
 import os
+import string
 import sys
 from pathlib import Path
 
-import yaml
+from thinkiplex.cli.scripts import course_status
+from thinkiplex.utils.files import quote_env_value, write_if_changed
 
-from thinkiplex.downloader.php_wrapper import PHPDownloader
-from thinkiplex.utils import Config
+logger = logging.getLogger(__name__)
+
+# Shared by the console and log-file handlers
+_FMT = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+# Paths relative to the working directory, built once per process
+_COURSES_DIR = Path("data/courses")
+_DEFAULT_CONFIG = Path("config/thinkiplex.yaml")
+
+# Template for the PHP downloader environment file generated from a course config;
+# values are substituted already quoted with quote_env_value
+_ENV_TEMPLATE = string.Template(
+    """# Generated by ThinkiPlex
+# For downloading all content, use the course link.
+COURSE_LINK=$course_link
+
+# For selective content downloads, use the JSON file created from Thinki Parser.
+# COURSE_DATA_FILE=""
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(),
-    ],
+CLIENT_DATE=$client_date
+COOKIE_DATA=$cookie_data
+
+# Quality Available: "Original File", "1080p", "720p", "540p", "360p", "224p"
+VIDEO_DOWNLOAD_QUALITY=$video_quality
+"""
 )
-logger = logging.getLogger(__name__)
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -49,8 +65,8 @@ Examples:
 
     parser.add_argument(
         "--config",
-        help="Path to the configuration file (default: config/thinkiplex.yaml)",
-        default="config/thinkiplex.yaml",
+        help=f"Path to the configuration file (default: {_DEFAULT_CONFIG})",
+        default=str(_DEFAULT_CONFIG),
     )
 
     parser.add_argument(
@@ -99,35 +115,31 @@ def list_courses(config_path: Path) -> None:
         print("Please run the setup wizard first.")
         return
 
+    # Imported here so that only this path pays for the YAML machinery
+    from thinkiplex.cli.course_selector import read_config_cached
+
     try:
-        with open(config_path, "r") as f:
-            config = yaml.safe_load(f)
+        config = read_config_cached(config_path)
 
         if not config or "courses" not in config or not config["courses"]:
             print("No courses found in configuration file.")
             return
 
-        print("\nAvailable courses:")
-        print("-----------------")
+        # Collect the listing and write it out in one go
+        out = ["\nAvailable courses:\n-----------------\n"]
         for course_name, course_config in config["courses"].items():
             show_name = course_config.get("show_name", course_name)
-            print(f"- {course_name}: {show_name}")
-
-            # Check if course has been downloaded
-            course_dir = Path("data/courses") / course_name
-            if course_dir.exists() and any(course_dir.iterdir()):
-                print("  Status: Downloaded")
-            else:
-                print("  Status: Not downloaded")
-
-            # Check if course has been organized for Plex
-            plex_dir = Path("data/courses") / course_name / "plex"
-            if plex_dir.exists() and any(plex_dir.iterdir()):
-                print("  Plex: Organized")
-            else:
-                print("  Plex: Not organized")
-
-            print()
+
+            # Check if course has been downloaded and organized for Plex
+            downloaded, _, organized = course_status(_COURSES_DIR / course_name)
+            status = "Downloaded" if downloaded else "Not downloaded"
+            plex_status = "Organized" if organized else "Not organized"
+
+            out.append(
+                f"- {course_name}: {show_name}\n  Status: {status}\n  Plex: {plex_status}\n\n"
+            )
+
+        sys.stdout.write("".join(out))
     except Exception as e:
         print(f"Error loading configuration: {e}")
 
@@ -145,6 +157,19 @@ def ensure_directories() -> None:
 
 def main() -> int:
     """Main entry point for the CLI."""
+    # Configure logging here rather than at import time, so importing this
+    # module as a library leaves the host's logging alone
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(_FMT)
+    logging.basicConfig(level=logging.INFO, handlers=[console_handler])
+
+    # Fast path: a bare --list-courses needs none of the other options, so skip
+    # building the argument parser entirely
+    if sys.argv[1:] == ["--list-courses"]:
+        ensure_directories()
+        list_courses(_DEFAULT_CONFIG)
+        return 0
+
     # Create the argument parser
     parser = create_parser()
     args = parser.parse_args()
@@ -155,9 +180,7 @@ def main() -> int:
 
     if args.log_file:
         file_handler = logging.FileHandler(args.log_file)
-        file_handler.setFormatter(
-            logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        )
+        file_handler.setFormatter(_FMT)
         logging.getLogger().addHandler(file_handler)
 
     # Ensure directories exist
@@ -185,6 +208,10 @@ def main() -> int:
         list_courses(config_path)
         return 0
 
+    # Heavy imports are deferred until past the --setup/--list-courses exits
+    from thinkiplex.downloader.php_wrapper import PHPDownloader
+    from thinkiplex.utils import Config
+
     # Load configuration
     config = Config(str(config_path))
     if args.course:
@@ -205,7 +232,7 @@ def main() -> int:
     logger.info(f"Processing course: {course_name}")
 
     # Create course directories if they don't exist
-    course_dir = Path("data/courses") / course_name
+    course_dir = _COURSES_DIR / course_name
     os.makedirs(course_dir, exist_ok=True)
 
     # Initialize the downloader
@@ -232,21 +259,14 @@ def main() -> int:
         env_file = Path("config/php_downloader.env")
         if not env_file.exists():
             # Create the environment file from the course configuration
-            env_content = f"""# Generated by ThinkiPlex
-# For downloading all content, use the course link.
-COURSE_LINK="{course_config.get("course_link", "")}"
-
-# For selective content downloads, use the JSON file created from Thinki Parser.
-# COURSE_DATA_FILE=""
-
-CLIENT_DATE="{course_config.get("client_date", "")}"
-COOKIE_DATA="{course_config.get("cookie_data", "")}"
-
-# Quality Available: "Original File", "1080p", "720p", "540p", "360p", "224p"
-VIDEO_DOWNLOAD_QUALITY="{course_config.get("video_quality", "720p")}"
-"""
-            with open(env_file, "w") as f:
-                f.write(env_content)
+            env_content = _ENV_TEMPLATE.substitute(
+                course_link=quote_env_value(course_config.get("course_link", "")),
+                client_date=quote_env_value(course_config.get("client_date", "")),
+                cookie_data=quote_env_value(course_config.get("cookie_data", "")),
+                video_quality=quote_env_value(course_config.get("video_quality", "720p")),
+            )
+            # The file holds the session cookie, so keep it private to the user
+            write_if_changed(env_file, env_content.encode(), mode=0o600)
 
         # Run the downloader
         success = downloader.download_course(course_link)
@@ -271,8 +291,8 @@ VIDEO_DOWNLOAD_QUALITY="{course_config.get("video_quality", "720p")}"
                 return 1
 
             # Set up the paths
-            source_dir = Path("data/courses") / course_name
-            plex_dir = Path("data/courses") / course_name / "plex"
+            source_dir = _COURSES_DIR / course_name
+            plex_dir = source_dir / "plex"
 
             # Create the Plex directory if it doesn't exist
             os.makedirs(plex_dir, exist_ok=True)
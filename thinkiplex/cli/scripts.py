@@ -7,12 +7,94 @@ This module provides functions that replace the shell scripts in the root direct
 import json
 import logging
 import os
+import string
 import subprocess
+import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
+
+from thinkiplex.utils.files import quote_env_value, write_if_changed
+
+try:
+    import ijson
+except ImportError:  # Optional speedup; fall back to json.load
+    ijson = None
 
 logger = logging.getLogger(__name__)
 
+# Locations relative to the project base directory, built once per process
+_COURSES_SUBPATH = Path("data") / "courses"
+_PHP_SUBPATH = Path("thinkiplex") / "downloader" / "php"
+
+# Template for the PHP downloader's .env file. Exactly one of course_link and
+# course_data_file is set; the other is left empty. Values are substituted
+# already quoted with quote_env_value.
+_PHP_ENV_TEMPLATE = string.Template(
+    """# For downloading all content, use the course link.
+COURSE_LINK=$course_link
+
+# For selective content downloads, use the JSON file created from Thinki Parser.
+# Copy the file to Thinki Downloader root folder (where thinkidownloader3.php is there).
+# Specify the file name below. Ex. COURSE_DATA_FILE="modified-course.json"
+COURSE_DATA_FILE=$course_data_file
+
+CLIENT_DATE=$client_date
+COOKIE_DATA=$cookie_data
+
+# Quality Available: "Original File", "1080p", "720p", "540p", "360p", "224p"
+VIDEO_DOWNLOAD_QUALITY=$video_quality
+"""
+)
+
+
+def has_entries(path: Union[str, Path]) -> bool:
+    """
+    Check whether a directory exists and contains at least one entry.
+
+    Reads a single directory entry instead of listing the whole directory.
+
+    Args:
+        path: Directory to check
+
+    Returns:
+        True if the directory exists and is not empty, False otherwise
+    """
+    try:
+        with os.scandir(path) as it:
+            next(it)
+        return True
+    except (StopIteration, FileNotFoundError, NotADirectoryError):
+        return False
+
+
+def course_status(course_dir: Union[str, Path]) -> Tuple[bool, bool, bool]:
+    """
+    Report the download and Plex state of a course directory in one pass.
+
+    Scans the course directory once and only descends into the ``downloads``
+    and ``plex`` subdirectories to probe them for a first entry.
+
+    Args:
+        course_dir: Course directory to inspect
+
+    Returns:
+        Tuple of (course directory is not empty, downloads is not empty,
+        plex is not empty)
+    """
+    has_any = downloaded = organized = False
+    try:
+        with os.scandir(course_dir) as it:
+            for entry in it:
+                has_any = True
+                if entry.name == "downloads" and entry.is_dir(follow_symlinks=False):
+                    downloaded = has_entries(entry.path)
+                elif entry.name == "plex" and entry.is_dir(follow_symlinks=False):
+                    organized = has_entries(entry.path)
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+
+    return has_any, downloaded, organized
+
 
 def run_php_downloader(
     course_link: Optional[str] = None,
@@ -40,7 +122,7 @@ def run_php_downloader(
     base_dir = Path.cwd()
 
     # Set up paths
-    php_dir = base_dir / "thinkiplex" / "downloader" / "php"
+    php_dir = base_dir / _PHP_SUBPATH
     php_env_file = php_dir / ".env"
 
     # Check if the PHP directory exists
@@ -50,45 +132,19 @@ def run_php_downloader(
 
     # Create a new environment file with the provided parameters
     try:
-        if json_file:
-            env_content = f"""# For downloading all content, use the course link.
-COURSE_LINK=""
-
-# For selective content downloads, use the JSON file created from Thinki Parser.
-# Copy the file to Thinki Downloader root folder (where thinkidownloader3.php is there).
-# Specify the file name below. Ex. COURSE_DATA_FILE="modified-course.json"
-COURSE_DATA_FILE="{json_file}"
-
-CLIENT_DATE="{client_date}"
-COOKIE_DATA="{cookie_data}"
-
-# Quality Available: "Original File", "1080p", "720p", "540p", "360p", "224p"
-VIDEO_DOWNLOAD_QUALITY="{video_quality}"
-"""
-        else:
-            env_content = f"""# For downloading all content, use the course link.
-COURSE_LINK="{course_link}"
-
-# For selective content downloads, use the JSON file created from Thinki Parser.
-# Copy the file to Thinki Downloader root folder (where thinkidownloader3.php is there).
-# Specify the file name below. Ex. COURSE_DATA_FILE="modified-course.json"
-COURSE_DATA_FILE=""
-
-CLIENT_DATE="{client_date}"
-COOKIE_DATA="{cookie_data}"
-
-# Quality Available: "Original File", "1080p", "720p", "540p", "360p", "224p"
-VIDEO_DOWNLOAD_QUALITY="{video_quality}"
-"""
-        with open(php_env_file, "w") as dest:
-            dest.write(env_content)
+        env_content = _PHP_ENV_TEMPLATE.substitute(
+            course_link=quote_env_value("" if json_file else course_link or ""),
+            course_data_file=quote_env_value(json_file or ""),
+            client_date=quote_env_value(client_date),
+            cookie_data=quote_env_value(cookie_data),
+            video_quality=quote_env_value(video_quality),
+        )
+        # The file holds the session cookie, so keep it private to the user
+        write_if_changed(php_env_file, env_content.encode(), mode=0o600)
     except Exception as e:
         logger.error(f"Error creating environment file: {e}")
         return False
 
-    # Change to the PHP directory
-    os.chdir(php_dir)
-
     # Build the command
     cmd = ["php", "thinkidownloader3.php"]
 
@@ -102,15 +158,12 @@ VIDEO_DOWNLOAD_QUALITY="{video_quality}"
 
     # Run the command
     try:
-        subprocess.run(cmd, check=True)
+        subprocess.run(cmd, check=True, cwd=php_dir)
         logger.info("PHP downloader completed successfully")
         return True
     except subprocess.CalledProcessError as e:
         logger.error(f"Error running PHP downloader: {e}")
         return False
-    finally:
-        # Change back to the base directory
-        os.chdir(base_dir)
 
 
 def run_php_downloader_docker(
@@ -147,7 +200,7 @@ def run_php_downloader_docker(
     base_dir = Path.cwd()
 
     # Set up paths
-    php_dir = base_dir / "thinkiplex" / "downloader" / "php"
+    php_dir = base_dir / _PHP_SUBPATH
 
     # Check if the PHP directory exists
     if not php_dir.exists():
@@ -162,30 +215,20 @@ def run_php_downloader_docker(
 
     # Extract course name from URL if not provided
     if not course_name and course_link:
-        try:
-            # Extract the course name from the URL
-            # Format: https://domain.thinkific.com/courses/take/course-name
-            parts = course_link.split("/")
-            course_name = parts[-1]  # Get the last part of the URL
-            logger.info(f"Extracted course name from URL: {course_name}")
-        except Exception as e:
-            logger.warning(
-                f"Could not extract course name from URL: {e}. Using 'course' as default."
-            )
-            course_name = "course"
+        # Extract the course name from the last segment of the URL
+        # Format: https://domain.thinkific.com/courses/take/course-name
+        course_name = course_link.rpartition("/")[2] or "course"
+        logger.info(f"Extracted course name from URL: {course_name}")
 
     if not course_name:
         logger.error("No course name provided or could be extracted from the URL.")
         return False
 
     # Create the course data directory if it doesn't exist
-    course_data_dir = base_dir / "data" / "courses" / course_name / "downloads"
+    course_data_dir = base_dir / _COURSES_SUBPATH / course_name / "downloads"
     os.makedirs(course_data_dir, exist_ok=True)
     logger.info(f"Ensuring course data directory exists: {course_data_dir}")
 
-    # Change to the PHP directory
-    os.chdir(php_dir)
-
     try:
         # Set environment variables for Docker
         env = os.environ.copy()
@@ -200,14 +243,14 @@ def run_php_downloader_docker(
         # Run docker compose with environment variables
         cmd = ["docker", "compose", "-f", "compose.yaml", "up"]
 
-        logger.info(f"Running Docker command from directory: {os.getcwd()}")
+        logger.info(f"Running Docker command from directory: {php_dir}")
         logger.info(f"Command: {' '.join(cmd)}")
         logger.info(f"Course link: {course_link}")
         logger.info(f"Course name: {course_name}")
         logger.info(f"Data directory: {course_data_dir}")
         logger.info(f"Target directory: {course_data_dir}")
 
-        subprocess.run(cmd, check=True, env=env)
+        subprocess.run(cmd, check=True, env=env, cwd=php_dir)
 
         if check_updates_only:
             logger.info("Docker update check completed successfully")
@@ -223,9 +266,6 @@ def run_php_downloader_docker(
     except Exception as e:
         logger.error(f"Unexpected error running Docker: {e}")
         return False
-    finally:
-        # Change back to the base directory
-        os.chdir(base_dir)
 
 
 def run_php_downloader_docker_selective(
@@ -254,7 +294,7 @@ def run_php_downloader_docker_selective(
     base_dir = Path.cwd()
 
     # Set up paths
-    php_dir = base_dir / "thinkiplex" / "downloader" / "php"
+    php_dir = base_dir / _PHP_SUBPATH
 
     # Check if the PHP directory exists
     if not php_dir.exists():
@@ -276,9 +316,12 @@ def run_php_downloader_docker_selective(
     # Extract course name from JSON if not provided
     if not course_name:
         try:
-            with open(json_path, "r") as f:
-                data = json.load(f)
-                course_name = data["course"]["slug"]
+            with open(json_path, "rb") as f:
+                if ijson is not None:
+                    # Stream only as far as the slug instead of parsing the whole file
+                    course_name = next(ijson.items(f, "course.slug"))
+                else:
+                    course_name = json.load(f)["course"]["slug"]
                 logger.info(f"Extracted course name from JSON: {course_name}")
         except Exception as e:
             logger.warning(
@@ -287,13 +330,10 @@ def run_php_downloader_docker_selective(
             course_name = "course"
 
     # Create the course data directory if it doesn't exist
-    course_data_dir = base_dir / "data" / "courses" / course_name / "downloads"
+    course_data_dir = base_dir / _COURSES_SUBPATH / course_name / "downloads"
     os.makedirs(course_data_dir, exist_ok=True)
     logger.info(f"Ensuring course data directory exists: {course_data_dir}")
 
-    # Change to the PHP directory
-    os.chdir(php_dir)
-
     try:
         # Set environment variables for Docker
         env = os.environ.copy()
@@ -307,14 +347,14 @@ def run_php_downloader_docker_selective(
         # Run docker compose with environment variables
         cmd = ["docker", "compose", "-f", "compose.selective.yaml", "up"]
 
-        logger.info(f"Running Docker command from directory: {os.getcwd()}")
+        logger.info(f"Running Docker command from directory: {php_dir}")
         logger.info(f"Command: {' '.join(cmd)}")
         logger.info(f"JSON file: {json_path.name}")
         logger.info(f"Course name: {course_name}")
         logger.info(f"Data directory: {course_data_dir}")
         logger.info(f"Target directory: {course_data_dir}")
 
-        subprocess.run(cmd, check=True, env=env)
+        subprocess.run(cmd, check=True, env=env, cwd=php_dir)
 
         logger.info("Docker selective download completed successfully")
         return True
@@ -324,9 +364,6 @@ def run_php_downloader_docker_selective(
     except Exception as e:
         logger.error(f"Unexpected error running Docker for selective download: {e}")
         return False
-    finally:
-        # Change back to the base directory
-        os.chdir(base_dir)
 
 
 def list_courses() -> List[str]:
@@ -342,38 +379,31 @@ def list_courses() -> List[str]:
     base_dir = Path.cwd()
 
     # Set up paths - everything is now in data/courses
-    courses_dir = base_dir / "data" / "courses"
+    courses_dir = base_dir / _COURSES_SUBPATH
 
     # Get the list of courses
     courses = []
 
-    print("\nAvailable courses:")
-    print("------------------")
+    # Collect the listing and write it out in one go
+    out = ["\nAvailable courses:\n------------------\n"]
     if courses_dir.exists():
-        for item in courses_dir.iterdir():
-            if item.is_dir():
-                course_name = item.name
-                courses.append(course_name)
+        with os.scandir(courses_dir) as it:
+            for entry in it:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
 
-                # Check if course has been downloaded
-                downloads_dir = item / "downloads"
-                if downloads_dir.exists() and any(downloads_dir.iterdir()):
-                    status = "Downloaded"
-                else:
-                    status = "Not downloaded"
+                course_name = entry.name
+                courses.append(course_name)
 
-                # Check if course has been organized for Plex
-                plex_dir = item / "plex"
-                if plex_dir.exists() and any(plex_dir.iterdir()):
-                    plex_status = "Organized"
-                else:
-                    plex_status = "Not organized"
+                # Check if course has been downloaded and organized for Plex
+                _, downloaded, organized = course_status(entry.path)
+                status = "Downloaded" if downloaded else "Not downloaded"
+                plex_status = "Organized" if organized else "Not organized"
 
-                print(f"- {course_name}")
-                print(f"  Status: {status}")
-                print(f"  Plex: {plex_status}")
-                print()
+                out.append(f"- {course_name}\n  Status: {status}\n  Plex: {plex_status}\n\n")
     else:
-        print("No courses directory found.")
+        out.append("No courses directory found.\n")
+
+    sys.stdout.write("".join(out))
 
     return courses
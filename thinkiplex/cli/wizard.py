@@ -6,27 +6,103 @@ This script guides users through setting up ThinkiPlex by creating a unified
 configuration file that replaces the multiple config files in the old structure.
 """
 
+import copy
+import functools
 import os
 import re
+import string
 import sys
+from collections import ChainMap
 from datetime import datetime
 from pathlib import Path
 
-import inquirer
-import yaml
-from inquirer import errors
+from thinkiplex.utils.files import quote_env_value, unquote_env_value, write_if_changed
+
+# Patterns for Thinkific course URLs, compiled once since the validator runs
+# on every prompt submission
+_THINKIFIC_URL_RE = re.compile(r"^https?://.*\.thinkific\.com/courses/take/.*$")
+_COURSE_NAME_RE = re.compile(r"/courses/take/([^/]+)")
+
+# Header and closing instructions, each written in a single call
+_WIZARD_BANNER = """ThinkiPlex Setup Wizard
+======================
+This wizard will help you configure ThinkiPlex for your courses.
+
+TIP: To authenticate with Thinkific, follow these steps:
+1. Open your Thinkific course in Chrome/Firefox and log in
+2. Press F12 to open Developer Tools and go to the Network tab
+3. Refresh the page
+4. Find a request to 'courses/take/your-course-name'
+5. Look for 'date' in request headers for Client Date value
+6. Look for 'cookie' in request headers for Cookie Data value
+
+"""
+_WIZARD_FOOTER = """
+Setup complete! You can now run ThinkiPlex with:
+  python -m thinkiplex
+Or to select a specific course:
+  python -m thinkiplex --course <course-name>
+"""
+
+# PHP downloader environment file written for the configured course. Course
+# settings fill the placeholders, quoted with quote_env_value, with
+# _PHP_ENV_DEFAULTS for missing keys.
+_PHP_ENV_TEMPLATE = string.Template(
+    """# Generated by ThinkiPlex Setup Wizard on $generated_at
+# For downloading all content, use the course link.
+COURSE_LINK=$course_link
+
+# For selective content downloads, use the JSON file created from Think Parser.
+# COURSE_DATA_FILE=""
+
+CLIENT_DATE=$client_date
+COOKIE_DATA=$cookie_data
+
+# Quality Available: "Original File", "1080p", "720p", "540p", "360p", "224p"
+VIDEO_DOWNLOAD_QUALITY=$video_download_quality
+"""
+)
+_PHP_ENV_DEFAULTS = {
+    "course_link": "",
+    "client_date": "",
+    "cookie_data": "",
+    "video_download_quality": "720p",
+}
+
+# Directories the wizard needs relative to the working directory
+_REQUIRED_DIRS = ("config", "data/courses", "logs")
+
+# Prompt choices shared by the global, edit and new-course questions
+_VIDEO_QUALITY_CHOICES = (
+    ("Original File", "Original File"),
+    ("1080p", "1080p"),
+    ("720p", "720p"),
+    ("540p", "540p"),
+    ("360p", "360p"),
+    ("224p", "224p"),
+)
+_AUDIO_QUALITY_CHOICES = (
+    ("0 (Best)", 0),
+    ("1", 1),
+    ("2", 2),
+    ("3", 3),
+    ("4", 4),
+    ("5", 5),
+    ("6", 6),
+    ("7", 7),
+    ("8", 8),
+    ("9 (Worst)", 9),
+)
+_AUDIO_FORMAT_CHOICES = ("mp3", "aac", "flac", "ogg")
 
 
 # Ensure the required directories exist
 def ensure_dirs():
     """Create the required directories if they don't exist."""
-    dirs = [
-        "config",
-        "data/courses",
-        "logs",
-    ]
-    for d in dirs:
-        os.makedirs(d, exist_ok=True)
+    for d in _REQUIRED_DIRS:
+        # A single stat on warm runs instead of makedirs walking every component
+        if not os.path.isdir(d):
+            os.makedirs(d, exist_ok=True)
 
 
 # Load existing configuration if available
@@ -34,8 +110,10 @@ def load_existing_config():
     """Load existing configuration if available."""
     config_file = Path("config/thinkiplex.yaml")
     if config_file.exists():
-        with open(config_file, "r") as f:
-            return yaml.safe_load(f)
+        from thinkiplex.cli.course_selector import read_config_cached
+
+        # The cached parse is shared, and the wizard edits the config in place
+        return copy.deepcopy(read_config_cached(config_file))
     return {
         "global": {
             "base_dir": str(Path.cwd()),
@@ -48,26 +126,34 @@ def load_existing_config():
     }
 
 
+# Parse a .env file. The stat signature is part of the cache key, so an edited
+# file is parsed again.
+@functools.lru_cache(maxsize=4)
+def _parse_env(path, mtime_ns, size):
+    """Parse KEY=value lines from an env file."""
+    env_data = {}
+    for line in Path(path).read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        key, sep, value = line.partition("=")
+        if sep:
+            # Remove quotes and escapes if present
+            env_data[key] = unquote_env_value(value)
+
+    return env_data
+
+
 # Load course data from .env file
 def load_env_data():
     """Load course data from .env file if it exists."""
-    env_file = Path(".env")
-    if not env_file.exists():
+    try:
+        st = os.stat(".env")
+    except FileNotFoundError:
         return {}
 
-    env_data = {}
-    with open(env_file, "r") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if "=" in line:
-                key, value = line.split("=", 1)
-                # Remove quotes if present
-                value = value.strip("\"'")
-                env_data[key] = value
-
-    return env_data
+    # Copy so callers can't modify the cached result
+    return dict(_parse_env(os.path.abspath(".env"), st.st_mtime_ns, st.st_size))
 
 
 # Validate course link
@@ -76,7 +162,9 @@ def validate_course_link(answers, current):
     if not current:
         return True  # Allow empty for now
 
-    if not re.match(r"^https?://.*\.thinkific\.com/courses/take/.*$", current):
+    if not _THINKIFIC_URL_RE.match(current):
+        from inquirer import errors
+
         raise errors.ValidationError(
             "",
             reason="Please enter a valid Thinkific course URL (e.g., https://example.thinkific.com/courses/take/course-name)",
@@ -85,13 +173,15 @@ def validate_course_link(answers, current):
     return True
 
 
-# Get course name from URL
+# Get course name from URL. Memoized because the show-name prompt's default
+# re-derives it from the same link.
+@functools.lru_cache(maxsize=32)
 def get_course_name_from_url(url):
     """Extract course name from URL."""
     if not url:
         return ""
 
-    match = re.search(r"/courses/take/([^/]+)", url)
+    match = _COURSE_NAME_RE.search(url)
     if match:
         return match.group(1)
     return ""
@@ -103,11 +193,11 @@ def detect_existing_courses():
     courses = []
 
     # Check downloads directory
-    downloads_dir = Path("data/courses")
-    if downloads_dir.exists():
-        for item in downloads_dir.iterdir():
-            if item.is_dir():
-                courses.append(item.name)
+    try:
+        with os.scandir("data/courses") as it:
+            courses = [entry.name for entry in it if entry.is_dir(follow_symlinks=False)]
+    except FileNotFoundError:
+        pass
 
     return courses
 
@@ -115,18 +205,13 @@ def detect_existing_courses():
 # Main wizard function
 def setup_wizard():
     """Run the setup wizard to configure ThinkiPlex."""
-    print("ThinkiPlex Setup Wizard")
-    print("======================")
-    print("This wizard will help you configure ThinkiPlex for your courses.")
-    print()
-    print("TIP: To authenticate with Thinkific, follow these steps:")
-    print("1. Open your Thinkific course in Chrome/Firefox and log in")
-    print("2. Press F12 to open Developer Tools and go to the Network tab")
-    print("3. Refresh the page")
-    print("4. Find a request to 'courses/take/your-course-name'")
-    print("5. Look for 'date' in request headers for Client Date value")
-    print("6. Look for 'cookie' in request headers for Cookie Data value")
-    print()
+    # Imported here so that importing this module (as the main CLI does on
+    # every run) doesn't pay for inquirer and PyYAML
+    import inquirer
+
+    from thinkiplex.cli.course_selector import save_config
+
+    sys.stdout.write(_WIZARD_BANNER)
 
     # Ensure directories exist
     ensure_dirs()
@@ -159,14 +244,7 @@ def setup_wizard():
             inquirer.List(
                 "video_quality",
                 message="Default video quality to download:",
-                choices=[
-                    ("Original File", "Original File"),
-                    ("1080p", "1080p"),
-                    ("720p", "720p"),
-                    ("540p", "540p"),
-                    ("360p", "360p"),
-                    ("224p", "224p"),
-                ],
+                choices=_VIDEO_QUALITY_CHOICES,
                 default=config["global"].get("video_quality", "720p"),
             ),
             inquirer.Confirm(
@@ -177,24 +255,13 @@ def setup_wizard():
             inquirer.List(
                 "audio_quality",
                 message="Default audio quality (0=best, 9=worst):",
-                choices=[
-                    ("0 (Best)", 0),
-                    ("1", 1),
-                    ("2", 2),
-                    ("3", 3),
-                    ("4", 4),
-                    ("5", 5),
-                    ("6", 6),
-                    ("7", 7),
-                    ("8", 8),
-                    ("9 (Worst)", 9),
-                ],
+                choices=_AUDIO_QUALITY_CHOICES,
                 default=config["global"].get("audio_quality", 0),
             ),
             inquirer.List(
                 "audio_format",
                 message="Default audio format:",
-                choices=["mp3", "aac", "flac", "ogg"],
+                choices=_AUDIO_FORMAT_CHOICES,
                 default=config["global"].get("audio_format", "mp3"),
             ),
         ]
@@ -243,14 +310,7 @@ def setup_wizard():
             inquirer.List(
                 "video_quality",
                 message="Video quality to download:",
-                choices=[
-                    ("Original File", "Original File"),
-                    ("1080p", "1080p"),
-                    ("720p", "720p"),
-                    ("540p", "540p"),
-                    ("360p", "360p"),
-                    ("224p", "224p"),
-                ],
+                choices=_VIDEO_QUALITY_CHOICES,
                 default=course_config.get(
                     "video_quality", config["global"]["video_quality"]
                 ),
@@ -275,14 +335,7 @@ def setup_wizard():
             inquirer.List(
                 "video_download_quality",
                 message="Video download quality:",
-                choices=[
-                    ("Original File", "Original File"),
-                    ("1080p", "1080p"),
-                    ("720p", "720p"),
-                    ("540p", "540p"),
-                    ("360p", "360p"),
-                    ("224p", "224p"),
-                ],
+                choices=_VIDEO_QUALITY_CHOICES,
                 default=course_config.get("video_download_quality", "720p"),
             ),
         ]
@@ -330,14 +383,7 @@ def setup_wizard():
             inquirer.List(
                 "video_quality",
                 message="Video quality to download:",
-                choices=[
-                    ("Original File", "Original File"),
-                    ("1080p", "1080p"),
-                    ("720p", "720p"),
-                    ("540p", "540p"),
-                    ("360p", "360p"),
-                    ("224p", "224p"),
-                ],
+                choices=_VIDEO_QUALITY_CHOICES,
                 default=config["global"]["video_quality"],
             ),
             inquirer.Confirm(
@@ -358,14 +404,7 @@ def setup_wizard():
             inquirer.List(
                 "video_download_quality",
                 message="Video download quality:",
-                choices=[
-                    ("Original File", "Original File"),
-                    ("1080p", "1080p"),
-                    ("720p", "720p"),
-                    ("540p", "540p"),
-                    ("360p", "360p"),
-                    ("224p", "224p"),
-                ],
+                choices=_VIDEO_QUALITY_CHOICES,
                 default="720p",
             ),
         ]
@@ -384,15 +423,11 @@ def setup_wizard():
         print(f"  thinkiplex --course {course_name}")
 
     # Save the configuration
-    with open("config/thinkiplex.yaml", "w") as f:
-        yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+    save_config(Path("config/thinkiplex.yaml"), config)
 
     print("\nConfiguration saved to config/thinkiplex.yaml")
     
     if answers["action"] == "new":
-        course_name = get_course_name_from_url(course_answers["course_link"])
-        if not course_name:
-            course_name = course_answers["show_name"].lower().replace(" ", "-")
         print(f"\nYou can now process your course with:")
         print(f"  thinkiplex --course {course_name}")
     elif answers["action"] == "edit":
@@ -402,38 +437,21 @@ def setup_wizard():
 
     # Create PHP environment file if needed
     if answers["action"] == "new" or answers["action"] == "edit":
-        # Get the appropriate course identifier
-        if answers["action"] == "new":
-            selected_course = course_name  # Use the extracted course name
-        else:
-            selected_course = edit_answers["course"]
-            
-        course_config = config["courses"][selected_course]
+        # course_name was set above for both the new and the edit action
+        course_config = config["courses"][course_name]
 
         # Create PHP environment file
-        env_content = f"""# Generated by ThinkiPlex Setup Wizard on {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-# For downloading all content, use the course link.
-COURSE_LINK="{course_config.get("course_link", "")}"
-
-# For selective content downloads, use the JSON file created from Think Parser.
-# COURSE_DATA_FILE=""
-
-CLIENT_DATE="{course_config.get("client_date", "")}"
-COOKIE_DATA="{course_config.get("cookie_data", "")}"
-
-# Quality Available: "Original File", "1080p", "720p", "540p", "360p", "224p"
-VIDEO_DOWNLOAD_QUALITY="{course_config.get("video_download_quality", "720p")}"
-"""
-
-        with open("config/php_downloader.env", "w") as f:
-            f.write(env_content)
+        settings = ChainMap(course_config, _PHP_ENV_DEFAULTS)
+        env_content = _PHP_ENV_TEMPLATE.substitute(
+            {key: quote_env_value(settings[key]) for key in _PHP_ENV_DEFAULTS},
+            generated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        )
+        # The file holds the session cookie, so keep it private to the user
+        write_if_changed(Path("config/php_downloader.env"), env_content.encode(), mode=0o600)
 
         print("PHP downloader environment file created at config/php_downloader.env")
 
-    print("\nSetup complete! You can now run ThinkiPlex with:")
-    print("  python -m thinkiplex")
-    print("Or to select a specific course:")
-    print("  python -m thinkiplex --course <course-name>")
+    sys.stdout.write(_WIZARD_FOOTER)
 
 
 if __name__ == "__main__":
@@ -4,18 +4,288 @@ PHP Downloader Wrapper
 This module provides a Python wrapper for the PHP downloader.
 """
 
+import collections
+import errno
+import functools
+import itertools
 import json
 import logging
 import os
 import shutil
 import subprocess
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Deque, Dict, FrozenSet, List, Optional, Set, Tuple
 
 from thinkiplex.utils import Config
+from thinkiplex.utils.files import fast_copy, link_or_copy
+from thinkiplex.utils.parallel import parallel_map
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to json
+    orjson = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
+# Output lines kept from a failed Docker run for the error message
+_ERROR_TAIL = 50
+
+# Concurrent moves when collecting a finished download; only cross-filesystem
+# copies benefit, same-filesystem renames are cheap either way
+_MOVE_WORKERS = min(8, os.cpu_count() or 4)
+
+# Parsed tracking files by path, with the (mtime, size, inode) signature they
+# were read or written at, so a course merged repeatedly in one process isn't
+# re-parsed each time. The least recently used entries are evicted past the limit.
+_TRACKING_CACHE: "collections.OrderedDict[str, Tuple[Tuple[int, int, int], Dict[str, Any]]]" = (
+    collections.OrderedDict()
+)
+_TRACKING_CACHE_SIZE = 32
+
+
+def _subprocess_env(overlay: Dict[str, str]) -> Dict[str, str]:
+    """
+    Build the environment for a PHP or Docker child process.
+
+    Args:
+        overlay: Variables to set on top of the current environment
+
+    Returns:
+        The merged environment
+    """
+    return {**os.environ, **overlay}
+
+
+def _run_streaming(
+    cmd: List[str], env: Dict[str, str], cwd: Path, keep: Optional[int] = None
+) -> Tuple[int, Deque[str]]:
+    """
+    Run a command, logging its output line by line as it is produced.
+
+    stderr is merged into stdout. Only the last ``keep`` lines are held in
+    memory, so long downloads don't buffer their whole log.
+
+    Args:
+        cmd: Command to run
+        env: Environment for the child process
+        cwd: Working directory for the child process
+        keep: Number of trailing output lines to return (None keeps all)
+
+    Returns:
+        Tuple of (return code, retained output lines)
+    """
+    lines: Deque[str] = collections.deque(maxlen=keep)
+    append = lines.append
+    log_lines = logger.isEnabledFor(logging.INFO)
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+        env=env,
+        cwd=cwd,
+    ) as proc:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            if log_lines:
+                logger.info(line.rstrip())
+            append(line)
+    return proc.returncode, lines
+
+
+def _load_json(path: Path) -> Any:
+    """
+    Parse a JSON file, using orjson when it is installed.
+
+    Args:
+        path: JSON file to parse
+
+    Returns:
+        The parsed document
+    """
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _find_json_file(directory: Path) -> Optional[Path]:
+    """
+    Find a JSON file directly inside a directory.
+
+    Stops at the first match and uses the file type from the directory
+    listing, so course directories full of media files aren't stat'ed entry
+    by entry.
+
+    Args:
+        directory: Directory to search
+
+    Returns:
+        Path of the first JSON file found, or None
+    """
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and entry.is_file():
+                    return Path(entry.path)
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return None
+
+
+def _load_tracking(path: Path) -> Dict[str, Any]:
+    """
+    Load a download tracking file, reusing the parsed data while unchanged.
+
+    Args:
+        path: Tracking file to load
+
+    Returns:
+        The tracking data. It is shared with the cache and must not be modified.
+    """
+    signature = _file_signature(path)
+    key = str(path)
+    cached = _TRACKING_CACHE.get(key)
+    if cached is not None and cached[0] == signature:
+        _TRACKING_CACHE.move_to_end(key)
+        return cached[1]
+
+    data: Dict[str, Any] = _load_json(path)
+    _remember_tracking(key, signature, data)
+    return data
+
+
+def _write_tracking(path: Path, data: Dict[str, Any]) -> None:
+    """
+    Write a download tracking file compactly and remember what was written.
+
+    Args:
+        path: Tracking file to write
+        data: Tracking data
+    """
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data))
+    else:
+        path.write_bytes(json.dumps(data, separators=(",", ":")).encode())
+    _remember_tracking(str(path), _file_signature(path), data)
+
+
+def _file_signature(path: Path) -> Tuple[int, int, int]:
+    """
+    Get the (mtime, size, inode) signature a cached file is validated against.
+
+    Args:
+        path: File to stat
+
+    Returns:
+        The file's signature
+    """
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _remember_tracking(key: str, signature: Tuple[int, int, int], data: Dict[str, Any]) -> None:
+    """
+    Cache parsed tracking data, evicting the least recently used entry if full.
+
+    Args:
+        key: Path of the tracking file
+        signature: Signature of the file the data belongs to
+        data: Tracking data
+    """
+    _TRACKING_CACHE[key] = (signature, data)
+    _TRACKING_CACHE.move_to_end(key)
+    while len(_TRACKING_CACHE) > _TRACKING_CACHE_SIZE:
+        _TRACKING_CACHE.popitem(last=False)
+
+
+def _move_into(src: Path, dest: Path) -> None:
+    """
+    Move a file or directory to dest, merging into an existing directory.
+
+    Entries are renamed into place, which only updates directory entries. Only
+    when dest is on another filesystem are the contents copied instead; the
+    caller removes the source afterwards.
+
+    Args:
+        src: File or directory to move
+        dest: Destination path
+    """
+    try:
+        if src.is_dir() and dest.is_dir():
+            for child in src.iterdir():
+                _move_into(child, dest / child.name)
+            return
+        os.replace(src, dest)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        if src.is_dir():
+            shutil.copytree(src, dest, copy_function=fast_copy, dirs_exist_ok=True)
+        else:
+            fast_copy(src, dest)
+
+
+def _course_signature(data: Dict[str, Any]) -> FrozenSet[Tuple[Any, Any, Any]]:
+    """
+    Reduce course data to the fields that decide whether it has updates.
+
+    Args:
+        data: Parsed course data
+
+    Returns:
+        One (chapter id, lesson id, updated_at) entry per lesson, plus a
+        (chapter id, None, None) entry per chapter
+    """
+    return frozenset(
+        itertools.chain(
+            ((chapter["id"], None, None) for chapter in data.get("chapters", [])),
+            (
+                (chapter["id"], lesson["id"], lesson.get("updated_at"))
+                for chapter in data.get("chapters", [])
+                for lesson in chapter.get("lessons", [])
+            ),
+        )
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _find_executable(name: str) -> Optional[str]:
+    """
+    Locate an executable on the PATH.
+
+    Looks the executable up on PATH instead of forking e.g. ``php --version``,
+    and remembers the answer for the rest of the process.
+
+    Args:
+        name: Executable name, e.g. "php" or "docker"
+
+    Returns:
+        Full path of the executable, or None if it isn't installed
+    """
+    return shutil.which(name)
+
+
+def _php_binary() -> Optional[str]:
+    """
+    Locate the php executable on the PATH.
+
+    Returns:
+        Full path of the php executable, or None if it isn't installed
+    """
+    return _find_executable("php")
+
+
+def _php_available() -> bool:
+    """
+    Check whether a php executable is on the PATH.
+
+    Returns:
+        True if PHP is available, False otherwise
+    """
+    return _php_binary() is not None
+
 
 class PHPDownloader:
     """Python wrapper for the PHP downloader."""
@@ -30,17 +300,46 @@ class PHPDownloader:
         """
         self.base_dir = base_dir
         self.config = config
-        self.php_script = (
-            self.base_dir / "thinkiplex" / "downloader" / "php" / "thinkidownloader3.php"
-        )
+        self.php_dir = self.base_dir / "thinkiplex" / "downloader" / "php"
+        self.php_script = self.php_dir / "thinkidownloader3.php"
+        self.config_dir = self.base_dir / "config"
+        self.courses_dir = self.base_dir / "data" / "courses"
+
+        # Parsed course JSON by path, with the (mtime, size) it was read at
+        self._course_data_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+        # Course JSON found by scanning a directory, by directory
+        self._json_path_cache: Dict[str, Path] = {}
+
+        # Directories already created by this downloader, so repeat calls skip
+        # the makedirs syscalls
+        self._created_dirs: Set[str] = set()
 
         # Create necessary directories
         self._create_directories()
 
+    def _ensure_dir(self, path: Path) -> None:
+        """
+        Create a directory (and parents) unless this downloader already did.
+
+        Args:
+            path: Directory to create
+        """
+        key = str(path)
+        if key in self._created_dirs:
+            return
+        os.makedirs(path, exist_ok=True)
+        self._created_dirs.add(key)
+
     def _create_directories(self) -> None:
         """Create necessary directories if they don't exist."""
-        os.makedirs(self.base_dir / "data" / "courses", exist_ok=True)
-        os.makedirs(self.base_dir / "config", exist_ok=True)
+        self._ensure_dir(self.courses_dir)
+        self._ensure_dir(self.config_dir)
+
+    @staticmethod
+    def invalidate_php_cache() -> None:
+        """Forget the cached PHP and Docker lookups, e.g. after installing PHP."""
+        _find_executable.cache_clear()
 
     def download_course(
         self,
@@ -64,9 +363,7 @@ class PHPDownloader:
         logger.info(f"Downloading course: {course_link}")
 
         # Check if PHP is installed
-        try:
-            subprocess.run(["php", "--version"], check=True, capture_output=True)
-        except (subprocess.SubprocessError, FileNotFoundError):
+        if not _php_available():
             logger.error("PHP is not installed or not in the PATH. Cannot download course.")
             return False
 
@@ -78,89 +375,140 @@ class PHPDownloader:
         # Extract course folder name from the URL
         course_folder = course_link.split("/")[-1]
 
-        # Check if we have an existing tracking file in the downloads directory
-        # and copy it to the PHP directory if it exists
-        downloads_dir = Path(self.base_dir) / "data" / "courses" / course_folder / "downloads"
+        # Create PHP course directory if it doesn't exist yet
+        php_course_dir = self.php_dir / course_folder
+        self._ensure_dir(php_course_dir)
+
+        # Copy the existing tracking file so the download resumes
+        self._stage_tracking_file(self._downloads_dir(course_folder), php_course_dir)
+
+        return self._run_php_for_course(
+            course_folder, course_link, client_date, cookie_data, video_quality
+        )
+
+    def _downloads_dir(self, course_folder: str) -> Path:
+        """
+        Get the downloads directory for a course.
+
+        Args:
+            course_folder: Name of the course folder
+
+        Returns:
+            The configured downloads directory, or data/courses/<course>/downloads
+        """
         if self.config and "global" in self.config.config:
             base_dir_template = self.config.config["global"].get("base_dir")
             if base_dir_template:
-                downloads_dir = Path(self.base_dir) / base_dir_template.format(
-                    course_name=course_folder
-                )
+                template = str(base_dir_template)
+                return Path(self.base_dir) / template.format(course_name=course_folder)
 
-        existing_tracking_file = downloads_dir / ".download_tracking"
-        php_tracking_file = self.php_script.parent / course_folder / ".download_tracking"
+        return self.courses_dir / course_folder / "downloads"
 
-        # Create PHP course directory if it doesn't exist yet
-        php_course_dir = self.php_script.parent / course_folder
-        if not php_course_dir.exists():
-            os.makedirs(php_course_dir, exist_ok=True)
+    def _stage_tracking_file(self, downloads_dir: Path, php_course_dir: Path) -> None:
+        """
+        Copy a course's existing tracking file to the PHP directory.
 
-        # Copy tracking file if it exists
+        Args:
+            downloads_dir: Downloads directory of the course
+            php_course_dir: Course directory in the PHP directory
+        """
+        existing_tracking_file = downloads_dir / ".download_tracking"
         if existing_tracking_file.exists() and existing_tracking_file.is_file():
             logger.info(
                 "Found existing tracking file. Copying to PHP directory to resume download."
             )
             try:
-                # Make sure the directory exists
-                os.makedirs(php_course_dir, exist_ok=True)
-                shutil.copy2(existing_tracking_file, php_tracking_file)
+                # PHP updates this copy while it runs, so it can't be a hardlink;
+                # a reflink or in-kernel copy still avoids a userspace pass
+                fast_copy(existing_tracking_file, php_course_dir / ".download_tracking")
             except Exception as e:
                 logger.warning(f"Failed to copy existing tracking file: {e}")
 
-        # Set up environment file
-        env_file = self.base_dir / "config" / "php_downloader.env"
-        php_env_file = self.php_script.parent / ".env"
-
-        # Create a new environment file with the provided parameters
-        try:
-            env_content = f"""# For downloading all content, use the course link.
-COURSE_LINK="{course_link}"
-
-# For selective content downloads, use the JSON file created from Thinki Parser.
-# Copy the file to Thinki Downloader root folder (where thinkidownloader3.php is there).
-# Specify the file name below. Ex. COURSE_DATA_FILE="modified-course.json"
-COURSE_DATA_FILE=""
+    def _run_php_for_course(
+        self,
+        course_folder: str,
+        course_link: str,
+        client_date: str,
+        cookie_data: str,
+        video_quality: str,
+    ) -> bool:
+        """
+        Run the PHP downloader for a course and collect its output.
 
-CLIENT_DATE="{client_date}"
-COOKIE_DATA="{cookie_data}"
+        Runs the PHP script in the course's own directory under the PHP
+        directory, then moves the downloaded files into the course's downloads
+        directory. PHP writes the chapters and its .download_tracking file into
+        its working directory, so each course gets its own and concurrent
+        downloads don't share state.
 
-# Quality Available: "Original File", "1080p", "720p", "540p", "360p", "224p"
-VIDEO_DOWNLOAD_QUALITY="{video_quality}"
-"""
-            with open(php_env_file, "w") as dest:
-                dest.write(env_content)
-        except Exception as e:
-            logger.error(f"Error creating environment file: {e}")
-            return False
+        Args:
+            course_folder: Name of the course folder
+            course_link: URL of the course
+            client_date: Client date for authentication
+            cookie_data: Cookie data for authentication
+            video_quality: Video quality to download
 
-        # Change to the PHP script directory
-        os.chdir(self.php_script.parent)
+        Returns:
+            True if successful, False otherwise
+        """
+        php_course_dir = self.php_dir / course_folder
+        self._ensure_dir(php_course_dir)
+
+        # The PHP config reads its settings from $_ENV, so pass them straight
+        # through the child's environment; no .env file is written or parsed
+        env = _subprocess_env(
+            {
+                "COURSE_LINK": course_link,
+                "CLIENT_DATE": client_date,
+                "COOKIE_DATA": cookie_data,
+                "VIDEO_DOWNLOAD_QUALITY": video_quality,
+                "TARGET_DIR": str(php_course_dir),
+            }
+        )
 
-        # Run the PHP script
+        # Run the PHP script from the course's directory
         try:
-            subprocess.run(["php", str(self.php_script), course_link], check=True)
+            subprocess.run(
+                # Run the resolved binary so exec doesn't search PATH again
+                [_php_binary() or "php", str(self.php_script), course_link],
+                check=True,
+                cwd=php_course_dir,
+                env=env,
+            )
             logger.info("PHP downloader completed successfully")
 
             # Move the downloaded course to the data/courses directory
             self._move_downloaded_course(course_folder)
 
-            # Remove the old tracking file from the PHP directory if it exists
-            old_tracking_file = self.php_script.parent / ".download_tracking"
-            if old_tracking_file.exists():
-                try:
-                    os.remove(old_tracking_file)
-                    logger.info("Removed old tracking file from PHP directory")
-                except Exception as e:
-                    logger.warning(f"Failed to remove old tracking file: {e}")
-
             return True
         except subprocess.CalledProcessError as e:
             logger.error(f"Error running PHP downloader: {e}")
             return False
-        finally:
-            # Change back to the base directory
-            os.chdir(self.base_dir)
+
+    def download_courses(self, jobs: List[Dict[str, Any]], max_workers: int = 4) -> List[bool]:
+        """
+        Download several courses concurrently.
+
+        Each download spends nearly all of its time waiting on the PHP process,
+        so the courses are run on a thread pool. Every course runs PHP in its
+        own directory, so jobs must be for distinct courses.
+
+        Args:
+            jobs: Keyword arguments for download_course, one dict per course
+            max_workers: Maximum number of concurrent downloads
+
+        Returns:
+            One result per job, in the order of jobs
+        """
+
+        def run(job: Dict[str, Any]) -> bool:
+            try:
+                return self.download_course(**job)
+            except Exception as e:
+                logger.error(f"Error downloading {job.get('course_link')}: {e}")
+                return False
+
+        return parallel_map(run, jobs, max_workers=max_workers)
 
     def download_selective(
         self,
@@ -183,11 +531,11 @@ VIDEO_DOWNLOAD_QUALITY="{video_quality}"
         """
         logger.info(f"Downloading selective content from: {json_file}")
 
-        # Check if PHP is installed
-        try:
-            subprocess.run(["php", "--version"], check=True, capture_output=True)
-        except (subprocess.SubprocessError, FileNotFoundError):
-            logger.error("PHP is not installed or not in the PATH. Cannot download course.")
+        # Selective downloads run PHP inside the Docker container, so it's
+        # Docker that must be installed here
+        docker = _find_executable("docker")
+        if docker is None:
+            logger.error("Docker is not installed or not in the PATH. Cannot download course.")
             return False
 
         # Check if the PHP script exists
@@ -202,53 +550,43 @@ VIDEO_DOWNLOAD_QUALITY="{video_quality}"
 
         # Extract course folder name from the JSON file
         try:
-            with open(json_file, "r") as f:
-                course_data = json.load(f)
-                course_folder = course_data["course"]["slug"]
-                course_name = course_data["course"]["name"]
+            course_data = _load_json(json_file)
+            course_folder = course_data["course"]["slug"]
+            course_name = course_data["course"]["name"]
         except Exception as e:
             logger.error(f"Error reading JSON file: {e}")
             return False
 
         # Determine the target directory for the course
-        target_dir = Path(self.base_dir) / "data" / "courses" / course_folder / "downloads"
-
-        # If we have a config object, use its base_dir setting
-        if self.config and "global" in self.config.config:
-            base_dir_template = self.config.config["global"].get("base_dir")
-            if base_dir_template:
-                target_dir = Path(self.base_dir) / base_dir_template.format(
-                    course_name=course_folder
-                )
+        target_dir = self._downloads_dir(course_folder)
 
         # Create the target directory if it doesn't exist
-        os.makedirs(target_dir, exist_ok=True)
+        self._ensure_dir(target_dir)
 
         # Check if we have an existing tracking file in the downloads directory
         existing_tracking_file = target_dir / ".download_tracking"
 
         # Set up environment variables
-        env = os.environ.copy()
-        env["COURSE_LINK"] = ""  # Not used for selective download
-        env["CLIENT_DATE"] = client_date
-        env["COOKIE_DATA"] = cookie_data
-        env["VIDEO_DOWNLOAD_QUALITY"] = video_quality
-        env["CHECK_UPDATES_ONLY"] = "false"
-        env["COURSE_NAME"] = course_folder
-        env["TARGET_DIR"] = str(target_dir)
-        env["JSON_FILE"] = str(json_file.absolute())
-
-        # Change to the PHP script directory
-        prev_dir = os.getcwd()
-        os.chdir(self.php_script.parent)
+        env = _subprocess_env(
+            {
+                "COURSE_LINK": "",  # Not used for selective download
+                "CLIENT_DATE": client_date,
+                "COOKIE_DATA": cookie_data,
+                "VIDEO_DOWNLOAD_QUALITY": video_quality,
+                "CHECK_UPDATES_ONLY": "false",
+                "COURSE_NAME": course_folder,
+                "TARGET_DIR": str(target_dir),
+                "JSON_FILE": str(json_file.absolute()),
+            }
+        )
 
         try:
             # Run docker compose for selective download
-            cmd = ["docker", "compose", "-f", "compose.selective.yaml", "up"]
-            result = subprocess.run(cmd, capture_output=True, text=True, env=env)
+            cmd = [docker, "compose", "-f", "compose.selective.yaml", "up"]
+            returncode, tail = _run_streaming(cmd, env, self.php_dir, keep=_ERROR_TAIL)
 
-            if result.returncode != 0:
-                logger.error(f"Error running Docker Compose: {result.stderr}")
+            if returncode != 0:
+                logger.error(f"Error running Docker Compose: {''.join(tail)}")
                 return False
 
             logger.info("PHP downloader completed successfully")
@@ -256,9 +594,6 @@ VIDEO_DOWNLOAD_QUALITY="{video_quality}"
         except Exception as e:
             logger.error(f"Error running PHP downloader: {e}")
             return False
-        finally:
-            # Change back to the previous directory
-            os.chdir(prev_dir)
 
     def _move_downloaded_course(self, course_folder: str) -> None:
         """
@@ -268,65 +603,78 @@ VIDEO_DOWNLOAD_QUALITY="{video_quality}"
             course_folder: Name of the course folder
         """
         # Set up paths
-        php_dir = self.php_script.parent
-        downloads_dir = Path(self.base_dir) / "data" / "courses" / course_folder / "downloads"
+        downloads_dir = self._downloads_dir(course_folder)
+        downloaded_dir = self.php_dir / course_folder
 
-        # If we have a config object, use its base_dir setting
-        if self.config and "global" in self.config.config:
-            base_dir_template = self.config.config["global"].get("base_dir")
-            if base_dir_template:
-                downloads_dir = Path(self.base_dir) / base_dir_template.format(
-                    course_name=course_folder
-                )
+        # First download of a course: rename the whole tree into place at once
+        if downloaded_dir.is_dir() and not downloads_dir.exists():
+            self._ensure_dir(downloads_dir.parent)
+            try:
+                os.replace(downloaded_dir, downloads_dir)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+            else:
+                self._created_dirs.discard(str(downloaded_dir))
+                self._created_dirs.add(str(downloads_dir))
+                self._json_path_cache.pop(str(downloads_dir), None)
+                logger.info(f"Moved downloaded course from PHP directory to: {downloads_dir}")
+                return
 
         # Create the downloads directory if it doesn't exist
-        os.makedirs(downloads_dir, exist_ok=True)
+        self._ensure_dir(downloads_dir)
 
         # Check if the course was downloaded to the PHP directory
-        downloaded_dir = php_dir / course_folder
         if downloaded_dir.exists():
             logger.info(f"Moving downloaded course from PHP directory to: {downloads_dir}")
 
-            # Copy the course files
-            for item in downloaded_dir.iterdir():
-                if item.is_dir():
-                    # Copy directory
-                    shutil.copytree(item, downloads_dir / item.name, dirs_exist_ok=True)
-                elif item.name == ".download_tracking":
+            # Move the course files, renaming them into place where possible.
+            # Items are independent, so cross-filesystem copies can overlap.
+            def move(item: Path) -> bool:
+                if item.name == ".download_tracking" and not item.is_dir():
                     # Special handling for tracking file - merge with existing if available
                     dest_tracking_file = downloads_dir / item.name
                     if dest_tracking_file.exists():
                         try:
-                            # Load existing tracking data
-                            with open(dest_tracking_file, "r") as f:
-                                existing_tracking = json.load(f)
+                            # Load existing tracking data (a copy, as it may be cached)
+                            existing_tracking = dict(_load_tracking(dest_tracking_file))
 
                             # Load new tracking data
-                            with open(item, "r") as f:
-                                new_tracking = json.load(f)
+                            new_tracking = _load_json(item)
 
                             # Merge tracking data (new data overwrites existing)
                             existing_tracking.update(new_tracking)
 
                             # Write back merged tracking data
-                            with open(dest_tracking_file, "w") as f:
-                                json.dump(existing_tracking, f, indent=4)
+                            _write_tracking(dest_tracking_file, existing_tracking)
 
                             logger.info("Updated tracking file with new download information")
                         except Exception as e:
                             logger.warning(f"Failed to merge tracking files: {e}")
-                            # If merge fails, just copy the new file
-                            shutil.copy2(item, dest_tracking_file)
+                            # If merge fails, just take the new file
+                            _move_into(item, dest_tracking_file)
                     else:
-                        # No existing tracking file, just copy it
-                        shutil.copy2(item, dest_tracking_file)
+                        # No existing tracking file, move it into place. Not a
+                        # hardlink: a later run copies it back over the PHP copy.
+                        _move_into(item, dest_tracking_file)
                 else:
-                    # Copy file
-                    shutil.copy2(item, downloads_dir / item.name)
+                    _move_into(item, downloads_dir / item.name)
+
+                return True
 
-            # Clean up the downloaded directory after copying
+            items = list(downloaded_dir.iterdir())
+            moved = parallel_map(move, items, max_workers=_MOVE_WORKERS)
+
+            # New files may include a different course JSON
+            self._json_path_cache.pop(str(downloads_dir), None)
+            if len(moved) != len(items):
+                # Keep the PHP copy so nothing is lost; errors are already logged
+                raise OSError(f"Failed to move all downloaded files from {downloaded_dir}")
+
+            # Clean up the downloaded directory after moving
             try:
                 shutil.rmtree(downloaded_dir)
+                self._created_dirs.discard(str(downloaded_dir))
                 logger.info(f"Removed temporary course directory: {downloaded_dir}")
             except Exception as e:
                 logger.warning(f"Failed to remove temporary course directory: {e}")
@@ -347,51 +695,82 @@ VIDEO_DOWNLOAD_QUALITY="{video_quality}"
             course_folder: Name of the course folder
 
         Returns:
-            Course data as a dictionary
+            Course data as a dictionary. It is cached until the file changes, so
+            callers must not modify it.
         """
         logger.info(f"Getting course data for: {course_folder}")
 
         # Look for the JSON file in the course directory
-        course_dir = self.base_dir / "data" / "courses" / course_folder
+        course_dir = self.courses_dir / course_folder
         json_file = course_dir / f"{course_folder}.json"
 
         if json_file.exists():
             try:
-                with open(json_file, "r") as f:
-                    data = json.load(f)
-                    logger.info(f"Loaded course data from: {json_file}")
-                    return data if isinstance(data, dict) else {}
+                data = self._load_course_json(json_file)
+                logger.info(f"Loaded course data from: {json_file}")
+                return data if isinstance(data, dict) else {}
             except Exception as e:
                 logger.error(f"Error loading course data from {json_file}: {e}")
 
-        # If not found, look for any JSON file in the course directory
-        if course_dir.exists():
-            json_files = list(course_dir.glob("*.json"))
-            if json_files:
+        # If not found, look for any JSON file in the course directory, and then
+        # in the downloads directory
+        for search_dir in (course_dir, course_dir / "downloads"):
+            found = self._json_file_in(search_dir)
+            if found:
                 try:
-                    with open(json_files[0], "r") as f:
-                        data = json.load(f)
-                        logger.info(f"Loaded course data from: {json_files[0]}")
-                        return data if isinstance(data, dict) else {}
-                except Exception as e:
-                    logger.error(f"Error loading course data from {json_files[0]}: {e}")
-
-        # If not found, look in the downloads directory
-        downloads_dir = course_dir / "downloads"
-        if downloads_dir.exists():
-            json_files = list(downloads_dir.glob("*.json"))
-            if json_files:
-                try:
-                    with open(json_files[0], "r") as f:
-                        data = json.load(f)
-                        logger.info(f"Loaded course data from: {json_files[0]}")
-                        return data if isinstance(data, dict) else {}
+                    data = self._load_course_json(found)
+                    logger.info(f"Loaded course data from: {found}")
+                    return data if isinstance(data, dict) else {}
                 except Exception as e:
-                    logger.error(f"Error loading course data from {json_files[0]}: {e}")
+                    logger.error(f"Error loading course data from {found}: {e}")
 
         logger.warning(f"No course data found for: {course_folder}")
         return {}
 
+    def _json_file_in(self, directory: Path) -> Optional[Path]:
+        """
+        Find a JSON file in a directory, reusing the last match while it exists.
+
+        Args:
+            directory: Directory to search
+
+        Returns:
+            Path of the JSON file, or None if there is none
+        """
+        key = str(directory)
+        found = self._json_path_cache.get(key)
+        if found is not None and found.exists():
+            return found
+
+        found = _find_json_file(directory)
+        if found is not None:
+            self._json_path_cache[key] = found
+        else:
+            self._json_path_cache.pop(key, None)
+        return found
+
+    def _load_course_json(self, json_file: Path) -> Any:
+        """
+        Parse a course JSON file, reusing the result until the file changes.
+
+        Args:
+            json_file: Path to the course JSON file
+
+        Returns:
+            The parsed JSON
+        """
+        st = os.stat(json_file)
+        signature = (st.st_mtime_ns, st.st_size)
+        key = str(json_file)
+
+        cached = self._course_data_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        data = _load_json(json_file)
+        self._course_data_cache[key] = (signature, data)
+        return data
+
     def check_for_updates(
         self,
         course_folder: str,
@@ -416,9 +795,7 @@ VIDEO_DOWNLOAD_QUALITY="{video_quality}"
         logger.info(f"Checking for updates to course: {course_folder}")
 
         # Check if PHP is installed
-        try:
-            subprocess.run(["php", "--version"], check=True, capture_output=True)
-        except (subprocess.SubprocessError, FileNotFoundError):
+        if not _php_available():
             logger.error("PHP is not installed or not in the PATH. Cannot check for updates.")
             return False
 
@@ -428,18 +805,9 @@ VIDEO_DOWNLOAD_QUALITY="{video_quality}"
             return False
 
         # Set up paths
-        course_dir = self.base_dir / "data" / "courses" / course_folder
-        downloads_dir = course_dir / "downloads"
+        course_dir = self.courses_dir / course_folder
         json_file = course_dir / f"{course_folder}.json"
 
-        # If we have a config object, use its base_dir setting
-        if self.config and "global" in self.config.config:
-            base_dir_template = self.config.config["global"].get("base_dir")
-            if base_dir_template:
-                downloads_dir = Path(self.base_dir) / base_dir_template.format(
-                    course_name=course_folder
-                )
-
         # Check if the course directory exists
         if not course_dir.exists():
             logger.error(f"Course directory not found: {course_dir}")
@@ -451,82 +819,22 @@ VIDEO_DOWNLOAD_QUALITY="{video_quality}"
             return False
 
         # Create the course directory in the PHP directory
-        php_dir = self.php_script.parent
-        php_course_dir = php_dir / course_folder
-        os.makedirs(php_course_dir, exist_ok=True)
+        php_course_dir = self.php_dir / course_folder
+        self._ensure_dir(php_course_dir)
 
-        # Check if we have an existing tracking file in the downloads directory
-        # and copy it to the PHP directory if it exists
-        existing_tracking_file = downloads_dir / ".download_tracking"
-        php_tracking_file = php_course_dir / ".download_tracking"
+        # Copy the existing tracking file so the download resumes
+        self._stage_tracking_file(self._downloads_dir(course_folder), php_course_dir)
 
-        # Copy tracking file if it exists
-        if existing_tracking_file.exists() and existing_tracking_file.is_file():
-            logger.info(
-                "Found existing tracking file. Copying to PHP directory to resume download."
-            )
-            try:
-                shutil.copy2(existing_tracking_file, php_tracking_file)
-            except Exception as e:
-                logger.warning(f"Failed to copy existing tracking file: {e}")
-
-        # Copy the JSON file to the course directory in the PHP directory
+        # Stage the JSON file in the course directory in the PHP directory. The
+        # PHP script only reads it, so a hardlink or reflink is enough.
         php_json_file = php_course_dir / json_file.name
-        shutil.copy2(json_file, php_json_file)
-
-        # Set up environment file
-        env_file = self.base_dir / "config" / "php_downloader.env"
-        php_env_file = self.php_script.parent / ".env"
-
-        # Create a new environment file with the provided parameters
-        try:
-            env_content = f"""# For downloading all content, use the course link.
-COURSE_LINK="{course_link}"
-
-# For selective content downloads, use the JSON file created from Thinki Parser.
-# Copy the file to Thinki Downloader root folder (where thinkidownloader3.php is there).
-# Specify the file name below. Ex. COURSE_DATA_FILE="modified-course.json"
-COURSE_DATA_FILE=""
-
-CLIENT_DATE="{client_date}"
-COOKIE_DATA="{cookie_data}"
-
-# Quality Available: "Original File", "1080p", "720p", "540p", "360p", "224p"
-VIDEO_DOWNLOAD_QUALITY="{video_quality}"
-"""
-            with open(php_env_file, "w") as dest:
-                dest.write(env_content)
-        except Exception as e:
-            logger.error(f"Error creating environment file: {e}")
-            return False
-
-        # Change to the PHP script directory
-        os.chdir(self.php_script.parent)
+        link_or_copy(json_file, php_json_file)
 
-        # Run the PHP script
         try:
-            subprocess.run(["php", str(self.php_script), course_link], check=True)
-            logger.info("PHP downloader completed successfully")
-
-            # Move the downloaded course to the data/courses directory
-            self._move_downloaded_course(course_folder)
-
-            # Remove the old tracking file from the PHP directory if it exists
-            old_tracking_file = self.php_script.parent / ".download_tracking"
-            if old_tracking_file.exists():
-                try:
-                    os.remove(old_tracking_file)
-                    logger.info("Removed old tracking file from PHP directory")
-                except Exception as e:
-                    logger.warning(f"Failed to remove old tracking file: {e}")
-
-            return True
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Error running PHP downloader: {e}")
-            return False
+            return self._run_php_for_course(
+                course_folder, course_link, client_date, cookie_data, video_quality
+            )
         finally:
-            # Change back to the base directory
-            os.chdir(self.base_dir)
             # Clean up the copied JSON file if it exists
             if php_json_file.exists() and php_json_file.is_file():
                 try:
@@ -545,54 +853,48 @@ VIDEO_DOWNLOAD_QUALITY="{video_quality}"
         Returns:
             True if updates were found, False otherwise
         """
-        # Check if the course has new chapters
-        current_chapters = set(chapter["id"] for chapter in current_data.get("chapters", []))
-        new_chapters = set(chapter["id"] for chapter in new_data.get("chapters", []))
+        # No updates is the common case. Dict equality compares the whole tree in
+        # C and stops at the first difference, so try it before walking lessons.
+        if current_data == new_data:
+            return False
 
-        if new_chapters - current_chapters:
-            logger.info(f"Found {len(new_chapters - current_chapters)} new chapters")
-            return True
+        # Next most common: only fields the checks below ignore have changed.
+        # If every (chapter, lesson, updated_at) in the new data already exists,
+        # there can be no new chapters, new lessons or updated lessons.
+        if _course_signature(new_data) <= _course_signature(current_data):
+            return False
 
-        # Check if existing chapters have new lessons
-        for new_chapter in new_data.get("chapters", []):
-            # Skip if this is a new chapter (already handled above)
-            if new_chapter["id"] not in current_chapters:
-                continue
-
-            # Find the corresponding current chapter
-            current_chapter = next(
-                (c for c in current_data.get("chapters", []) if c["id"] == new_chapter["id"]),
-                None,
-            )
-            if not current_chapter:
-                continue
+        # Index the current course once so every lookup below is O(1)
+        current_by_id = {c["id"]: c for c in current_data.get("chapters", [])}
+        current_lessons = {
+            chapter_id: {lesson["id"]: lesson for lesson in chapter.get("lessons", [])}
+            for chapter_id, chapter in current_by_id.items()
+        }
+        new_chapters = new_data.get("chapters", [])
 
-            # Compare lessons
-            current_lessons = set(lesson["id"] for lesson in current_chapter.get("lessons", []))
-            new_lessons = set(lesson["id"] for lesson in new_chapter.get("lessons", []))
+        # Check if the course has new chapters
+        new_chapter_ids = {chapter["id"] for chapter in new_chapters}
+        added_chapters = new_chapter_ids - current_by_id.keys()
+        if added_chapters:
+            logger.info(f"Found {len(added_chapters)} new chapters")
+            return True
 
-            if new_lessons - current_lessons:
+        # Check if existing chapters have new lessons
+        for new_chapter in new_chapters:
+            lessons = current_lessons[new_chapter["id"]]
+            new_lesson_ids = {lesson["id"] for lesson in new_chapter.get("lessons", [])}
+            added_lessons = new_lesson_ids - lessons.keys()
+            if added_lessons:
                 logger.info(
-                    f"Found {len(new_lessons - current_lessons)} new lessons in chapter {new_chapter['title']}"
+                    f"Found {len(added_lessons)} new lessons in chapter {new_chapter['title']}"
                 )
                 return True
 
         # Check if any lesson content has been updated
-        for new_chapter in new_data.get("chapters", []):
-            current_chapter = next(
-                (c for c in current_data.get("chapters", []) if c["id"] == new_chapter["id"]),
-                None,
-            )
-            if not current_chapter:
-                continue
-
+        for new_chapter in new_chapters:
+            lessons = current_lessons[new_chapter["id"]]
             for new_lesson in new_chapter.get("lessons", []):
-                current_lesson = next(
-                    (l for l in current_chapter.get("lessons", []) if l["id"] == new_lesson["id"]),
-                    None,
-                )
-                if not current_lesson:
-                    continue
+                current_lesson = lessons[new_lesson["id"]]
 
                 # Compare lesson content (e.g., updated video)
                 if new_lesson.get("updated_at") != current_lesson.get("updated_at"):
@@ -611,6 +913,8 @@ VIDEO_DOWNLOAD_QUALITY="{video_quality}"
         """
         Run the PHP script using Docker.
 
+        The output is logged line by line as it is produced.
+
         Args:
             course_url: URL of the course to download
             cookie_data: Cookie data for authentication
@@ -618,44 +922,32 @@ VIDEO_DOWNLOAD_QUALITY="{video_quality}"
             check_updates_only: Whether to only check for updates without downloading
 
         Returns:
-            Tuple of (return code, output)
+            Tuple of (return code, output). The output includes stderr,
+            interleaved with stdout in the order it was written.
         """
         # Extract course folder name from the URL
         course_folder = course_url.split("/")[-1]
 
         # Determine the target directory for the course
-        target_dir = Path(self.base_dir) / "data" / "courses" / course_folder / "downloads"
-
-        # If we have a config object, use its base_dir setting
-        if self.config and "global" in self.config.config:
-            base_dir_template = self.config.config["global"].get("base_dir")
-            if base_dir_template:
-                target_dir = Path(self.base_dir) / base_dir_template.format(
-                    course_name=course_folder
-                )
+        target_dir = self._downloads_dir(course_folder)
 
         # Create the target directory if it doesn't exist
-        os.makedirs(target_dir, exist_ok=True)
+        self._ensure_dir(target_dir)
 
         # Set up environment variables
-        env = os.environ.copy()
-        env["COURSE_LINK"] = course_url
-        env["CLIENT_DATE"] = ""
-        env["COOKIE_DATA"] = cookie_data
-        env["VIDEO_DOWNLOAD_QUALITY"] = video_quality
-        env["CHECK_UPDATES_ONLY"] = str(check_updates_only).lower()
-        env["COURSE_NAME"] = course_folder
-        env["TARGET_DIR"] = str(target_dir)  # Pass the target directory to the PHP script
-
-        # Change to the PHP script directory
-        prev_dir = os.getcwd()
-        os.chdir(self.php_script.parent)
+        env = _subprocess_env(
+            {
+                "COURSE_LINK": course_url,
+                "CLIENT_DATE": "",
+                "COOKIE_DATA": cookie_data,
+                "VIDEO_DOWNLOAD_QUALITY": video_quality,
+                "CHECK_UPDATES_ONLY": str(check_updates_only).lower(),
+                "COURSE_NAME": course_folder,
+                "TARGET_DIR": str(target_dir),  # Pass the target directory to the PHP script
+            }
+        )
 
-        try:
-            # Run docker compose
-            cmd = ["docker", "compose", "-f", "compose.yaml", "up"]
-            result = subprocess.run(cmd, capture_output=True, text=True, env=env)
-            return result.returncode, result.stdout
-        finally:
-            # Change back to the previous directory
-            os.chdir(prev_dir)
+        # Run docker compose
+        cmd = [_find_executable("docker") or "docker", "compose", "-f", "compose.yaml", "up"]
+        returncode, lines = _run_streaming(cmd, env, self.php_dir)
+        return returncode, "".join(lines)
@@ -325,6 +325,7 @@ def main() -> int:
     try:
         from thinkiplex.cli.cleanup import run_cleanup
         from thinkiplex.cli.course_selector import (
+            CourseRegistry,
             get_course_config,
             select_course_interactive,
         )
@@ -341,11 +342,14 @@ def main() -> int:
         logger.error("Please make sure all dependencies are installed.")
         return 1
 
+    # Parse the course configuration once and share it with the selector helpers
+    registry = CourseRegistry()
+
     # Handle authentication update
     if args.update_auth:
         if not args.course:
             # If no course specified, prompt the user to select one
-            course_name = select_course_interactive()
+            course_name = select_course_interactive(registry=registry)
             if not course_name:
                 logger.error("No course selected.")
                 return 1
@@ -504,7 +508,7 @@ def main() -> int:
             return 0
         elif choice == "2":
             # Select a course to process
-            selected_course = select_course_interactive()
+            selected_course = select_course_interactive(registry=registry)
             if not selected_course:
                 return 0
             # Set the course name for processing
@@ -572,7 +576,7 @@ def main() -> int:
             return 0 if run_cleanup() else 1
         elif choice == "7":
             # Update authentication data
-            selected_course = select_course_interactive()
+            selected_course = select_course_interactive(registry=registry)
             if not selected_course:
                 return 0
 
@@ -623,12 +627,12 @@ def main() -> int:
             return 0
         elif choice == "8":
             # Extract audio from videos
-            selected_course = select_course_interactive()
+            selected_course = select_course_interactive(registry=registry)
             if not selected_course:
                 return 0
 
             # Get course configuration
-            course_config = get_course_config(selected_course)
+            course_config = get_course_config(selected_course, registry=registry)
             if not course_config:
                 logger.error(f"Course '{selected_course}' not found in configuration.")
                 return 1
@@ -677,7 +681,7 @@ def main() -> int:
     course_name = cast(str, course_name)
 
     # Get course configuration
-    course_config = get_course_config(course_name)
+    course_config = get_course_config(course_name, registry=registry)
     if not course_config:
         logger.error(f"Course '{course_name}' not found in configuration.")
         return 1
@@ -7,7 +7,6 @@ This module provides functionality for extracting audio from video files.
 import logging
 import os
 import re
-import shutil
 import subprocess
 import time
 from datetime import datetime
@@ -16,9 +15,13 @@ from typing import Dict, List, Optional
 
 from thinkiplex.downloader.php_wrapper import PHPDownloader
 from thinkiplex.utils import Config
+from thinkiplex.utils.files import fast_copy
 
 logger = logging.getLogger(__name__)
 
+# Paths likely to contain lesson videos, matched in one regex scan
+_PRIORITY_PATH_RE = re.compile("watch|video|playback", re.IGNORECASE)
+
 
 def extract_episode_number(directory_name: str) -> str:
     """
@@ -78,13 +81,10 @@ def find_video_file(directory: Path) -> Optional[Path]:
     # Define common video extensions
     video_extensions = [".mp4", ".mkv", ".avi", ".mov", ".webm", ".m4v"]
 
-    # First try to find in paths that might contain lesson videos
-    priority_patterns = ["playback-lesson", "watch", "video", "playback"]
-
     # Look in priority directories first
     for root, _, files in os.walk(directory):
         # Check if this directory matches any priority patterns
-        if any(pattern in root.lower() for pattern in priority_patterns):
+        if _PRIORITY_PATH_RE.search(root):
             for file in files:
                 file_ext = os.path.splitext(file)[1].lower()
                 if file_ext in video_extensions:
@@ -721,7 +721,7 @@ def process_videos_for_plex(
         temp_file = output_file.with_suffix(f".temp_{int(time.time())}{video_ext}")
         try:
             logger.info(f"Copying {video_file} to temporary file")
-            shutil.copy2(video_file, temp_file)
+            fast_copy(video_file, temp_file)
 
             # Now add metadata using ffmpeg
             logger.info(f"Adding metadata to {title}")
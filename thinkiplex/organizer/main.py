@@ -6,13 +6,18 @@ This module provides functionality to organize course content for Plex.
 
 import logging
 import os
-import shutil
+import re
 import subprocess
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from thinkiplex.utils.files import fast_copy
+
 logger = logging.getLogger(__name__)
 
+# Lesson subdirectories likely to hold the video, matched in one regex scan
+_PRIORITY_DIR_RE = re.compile("watch|video|playback|lesson", re.IGNORECASE)
+
 
 def organize_course(
     source_dir: Path,
@@ -155,7 +160,7 @@ def process_video_lesson(
 
     # Copy the video file to the Plex directory
     logger.info(f"Copying video file to: {plex_file}")
-    shutil.copy2(video_file, plex_file)
+    fast_copy(video_file, plex_file)
 
     # Add metadata to the video file
     add_video_metadata(
@@ -206,7 +211,7 @@ def process_document_lesson(
 
     # Copy the document file to the Plex directory
     logger.info(f"Copying document file to: {plex_file}")
-    shutil.copy2(document_file, plex_file)
+    fast_copy(document_file, plex_file)
 
 
 def process_presentation_lesson(
@@ -238,7 +243,7 @@ def process_presentation_lesson(
 
     # Copy the presentation file to the Plex directory
     logger.info(f"Copying presentation file to: {plex_file}")
-    shutil.copy2(presentation_file, plex_file)
+    fast_copy(presentation_file, plex_file)
 
     # Find the audio file if available
     audio_file = find_audio_file(source_dir, lesson_id)
@@ -278,9 +283,8 @@ def find_video_file(source_dir: Path, lesson_id: str) -> Optional[Path]:
             return video_files[0]
 
     # Check subdirectories for video files (e.g., "watch", "video", "playback" folders)
-    priority_dirs = ["watch", "video", "playback", "lesson"]
     for subdir in lesson_dir.iterdir():
-        if subdir.is_dir() and any(pattern in subdir.name.lower() for pattern in priority_dirs):
+        if subdir.is_dir() and _PRIORITY_DIR_RE.search(subdir.name):
             for ext in video_extensions:
                 video_files = list(subdir.glob(f"*{ext}"))
                 if video_files:
@@ -5,12 +5,13 @@ This module provides functions for processing video and audio files.
 """
 
 import os
-import shutil
+import re
 import subprocess
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 from ..utils.exceptions import FileSystemError, MediaProcessingError
+from ..utils.files import fast_copy
 from ..utils.logging import get_logger
 from ..utils.parallel import parallel_map
 
@@ -20,6 +21,15 @@ logger = get_logger()
 class MediaProcessor:
     """Processes video and audio files for Plex."""
 
+    # Fixed leading arguments shared by every ffmpeg invocation
+    _FFMPEG_ARGV_PREFIX = ("ffmpeg", "-v", "quiet", "-i")
+
+    # Trailing arguments for the stream-copy metadata pass (output path follows)
+    _METADATA_ARGV_SUFFIX = ("-codec", "copy")
+
+    # Directory names likely to hold lesson videos, matched in one regex scan
+    _PRIORITY_DIR_RE = re.compile("watch|video|playback|lesson", re.IGNORECASE)
+
     def __init__(self, ffmpeg_config: dict):
         """Initialize the media processor.
 
@@ -30,6 +40,31 @@ class MediaProcessor:
         self.audio_quality = ffmpeg_config.get("audio_quality", "0")
         self.audio_format = ffmpeg_config.get("audio_format", "mp3")
 
+        # Audio encoding arguments depend only on the configuration, so build them once
+        self._audio_argv = (
+            "-vn",
+            "-c:a",
+            f"lib{self.audio_format}",
+            "-q:a",
+            str(self.audio_quality),
+        )
+
+        # Output directories already created by this processor, so copying or
+        # extracting many files into the same season directory skips makedirs
+        self._created_dirs: Set[str] = set()
+
+    def _ensure_parent_dir(self, path: str) -> None:
+        """Create the parent directory of a path unless this processor already did.
+
+        Args:
+            path: File path whose directory should exist
+        """
+        directory = os.path.dirname(path)
+        if directory in self._created_dirs:
+            return
+        os.makedirs(directory, exist_ok=True)
+        self._created_dirs.add(directory)
+
     def find_video_file(self, directory: str) -> Optional[str]:
         """Find the main video file in a directory.
 
@@ -42,14 +77,11 @@ class MediaProcessor:
         # Define common video extensions
         video_extensions = [".mp4", ".mkv", ".avi", ".mov", ".webm", ".m4v"]
 
-        # Define priority patterns to search in first
-        priority_patterns = ["watch", "video", "playback", "lesson"]
-
         # First, try to find video files in subdirectories that match specific patterns
         video_dirs = []
         for root, dirs, _ in os.walk(directory):
             for d in dirs:
-                if any(pattern in d.lower() for pattern in priority_patterns):
+                if self._PRIORITY_DIR_RE.search(d):
                     video_dirs.append(os.path.join(root, d))
 
         # Search in video directories first
@@ -84,10 +116,10 @@ class MediaProcessor:
         """
         try:
             # Ensure target directory exists
-            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            self._ensure_parent_dir(target_path)
 
-            # Copy the file
-            shutil.copy2(source_path, target_path)
+            # Copy the file along with its permissions and timestamps
+            fast_copy(source_path, target_path)
             logger.info(f"Copied {source_path} to {target_path}")
 
             return True
@@ -112,20 +144,21 @@ class MediaProcessor:
 
         try:
             # Build ffmpeg command
-            cmd = ["ffmpeg", "-v", "quiet", "-i", video_path]
+            cmd = [*self._FFMPEG_ARGV_PREFIX, video_path]
 
             # Add metadata arguments
             for key, value in metadata.items():
-                cmd.extend(["-metadata", f"{key}={value}"])
+                cmd += ("-metadata", f"{key}={value}")
 
             # Add output arguments
-            cmd.extend(["-codec", "copy", temp_path])
+            cmd += self._METADATA_ARGV_SUFFIX
+            cmd.append(temp_path)
 
             # Run ffmpeg
             subprocess.run(cmd, check=True)
 
-            # Replace original file with temp file
-            shutil.move(temp_path, video_path)
+            # Atomically replace the original with the temp file (same directory)
+            os.replace(temp_path, video_path)
 
             logger.info(f"Added metadata to {video_path}")
             return True
@@ -154,25 +187,14 @@ class MediaProcessor:
 
         try:
             # Ensure audio directory exists
-            os.makedirs(os.path.dirname(audio_path), exist_ok=True)
+            self._ensure_parent_dir(audio_path)
 
             # Build ffmpeg command
-            cmd = [
-                "ffmpeg",
-                "-v",
-                "quiet",
-                "-i",
-                video_path,
-                "-vn",
-                "-c:a",
-                f"lib{self.audio_format}",
-                "-q:a",
-                str(self.audio_quality),
-            ]
+            cmd = [*self._FFMPEG_ARGV_PREFIX, video_path, *self._audio_argv]
 
             # Add metadata arguments
             for key, value in metadata.items():
-                cmd.extend(["-metadata", f"{key}={value}"])
+                cmd += ("-metadata", f"{key}={value}")
 
             # Add output path
             cmd.append(audio_path)
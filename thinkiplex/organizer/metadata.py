@@ -11,6 +11,18 @@ from ..utils.logging import get_logger
 
 logger = get_logger()
 
+# Generic descriptions picked by keywords in the episode directory name, checked
+# in order; the first template whose keywords match is used
+_DESCRIPTION_TEMPLATES = (
+    (("live", "call"), "Live session {ep_num} focusing on {lower_title}"),
+    (("workshop",), "Workshop session {ep_num} with practical exercises on {lower_title}"),
+    (
+        ("practice",),
+        "Practice session {ep_num} with guided exercises related to {lower_title}",
+    ),
+)
+_DEFAULT_DESCRIPTION = "Episode {ep_num}: {title}"
+
 
 class MetadataExtractor:
     """Extracts metadata from course data and directory names."""
@@ -23,6 +35,37 @@ class MetadataExtractor:
         """
         self.course_data = course_data or {}
 
+        # Episode lookups by content id/position and by chapter position, built
+        # on first use so each lookup is a dict hit instead of a list scan
+        self._content_index: Optional[Dict[Tuple[str, Any], Tuple[int, str, str]]] = None
+        self._chapter_index: Dict[Any, Tuple[str, str]] = {}
+
+    def _build_index(self) -> Dict[Tuple[str, Any], Tuple[int, str, str]]:
+        """Index the course contents and chapters in one pass each.
+
+        The first matching entry wins, as with the linear search it replaces.
+
+        Returns:
+            The content index, keyed by ("id", id) and ("position", position)
+        """
+        contents: Dict[Tuple[str, Any], Tuple[int, str, str]] = {}
+        for order, content in enumerate(self.course_data.get("contents") or ()):
+            entry = (order, content.get("name", ""), content.get("description", ""))
+            contents.setdefault(("id", str(content.get("id", ""))), entry)
+            position = content.get("position")
+            if isinstance(position, (int, float)):
+                contents.setdefault(("position", position), entry)
+
+        for chapter in self.course_data.get("chapters") or ():
+            position = chapter.get("position")
+            if isinstance(position, (int, float)):
+                self._chapter_index.setdefault(
+                    position, (chapter.get("name", ""), chapter.get("description", ""))
+                )
+
+        self._content_index = contents
+        return contents
+
     def extract_episode_number(self, dir_name: str) -> int:
         """Extract episode number from directory name.
 
@@ -49,23 +92,26 @@ class MetadataExtractor:
         if not self.course_data:
             return None, None
 
-        # Try to find the content in the course data
-        if "contents" in self.course_data:
-            for content in self.course_data["contents"]:
-                # Check if this content matches the episode number
-                content_id = content.get("id", "")
-                if str(content_id) == str(ep_num) or content.get("position") == ep_num:
-                    title = content.get("name", "")
-                    description = content.get("description", "")
-                    return title, description
+        content_index = self._content_index
+        if content_index is None:
+            content_index = self._build_index()
+
+        # Try to find the content in the course data, by id or by position
+        hits = [
+            hit
+            for hit in (
+                content_index.get(("id", str(ep_num))),
+                content_index.get(("position", ep_num)),
+            )
+            if hit is not None
+        ]
+        if hits:
+            _, title, description = min(hits)
+            return title, description
 
         # Try to find in chapters
-        if "chapters" in self.course_data:
-            for chapter in self.course_data["chapters"]:
-                if chapter.get("position") == ep_num:
-                    title = chapter.get("name", "")
-                    description = chapter.get("description", "")
-                    return title, description
+        if ep_num in self._chapter_index:
+            return self._chapter_index[ep_num]
 
         return None, None
 
@@ -111,16 +157,16 @@ class MetadataExtractor:
         title = self.get_episode_title(ep_num, dir_name)
 
         # Generate description based on directory name patterns
-        if "live" in dir_name.lower() or "call" in dir_name.lower():
-            description = f"Live session {ep_num} focusing on {title.lower()}"
-        elif "workshop" in dir_name.lower():
-            description = f"Workshop session {ep_num} with practical exercises on {title.lower()}"
-        elif "practice" in dir_name.lower():
-            description = (
-                f"Practice session {ep_num} with guided exercises related to {title.lower()}"
-            )
-        else:
-            description = f"Episode {ep_num}: {title}"
+        lower_name = dir_name.lower()
+        template = next(
+            (
+                template
+                for keywords, template in _DESCRIPTION_TEMPLATES
+                if any(keyword in lower_name for keyword in keywords)
+            ),
+            _DEFAULT_DESCRIPTION,
+        )
+        description = template.format(ep_num=ep_num, title=title, lower_title=title.lower())
 
         logger.info(f"Using generated description for episode {ep_num}")
         return description
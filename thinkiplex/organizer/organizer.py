@@ -150,16 +150,18 @@ class CourseOrganizer:
         """
         logger.info(f"Scanning for episodes in {self.source_dir}...")
 
-        # Get all directories that start with a number
-        dirs = [
-            d
-            for d in os.listdir(self.source_dir)
-            if os.path.isdir(os.path.join(self.source_dir, d))
-            and re.match(r"^[0-9]", d)
-        ]
+        # Get all directories that start with a number. The name test runs
+        # first, and the entry type comes from the listing, so other entries
+        # are never stat'ed
+        with os.scandir(self.source_dir) as it:
+            dirs = [
+                entry.name
+                for entry in it
+                if re.match(r"^[0-9]", entry.name) and entry.is_dir()
+            ]
 
         # Sort directories by episode number
-        dirs.sort(key=lambda x: self.metadata_extractor.extract_episode_number(x))
+        dirs.sort(key=self.metadata_extractor.extract_episode_number)
 
         # Process each directory
         successful_episodes = 0
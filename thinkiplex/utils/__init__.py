@@ -4,7 +4,29 @@ Utilities package for ThinkiPlex.
 This package provides utility functions and classes for ThinkiPlex.
 """
 
-from .config import Config
-from .logging import get_logger, setup_logging
+import importlib
+from typing import Any, List
+
+# Public names and the submodules that provide them. They are imported on first
+# access (PEP 562) so that light helpers such as utils.files don't pull in the
+# config schemas and pydantic.
+_LAZY = {
+    "Config": ".config",
+    "setup_logging": ".logging",
+    "get_logger": ".logging",
+}
 
 __all__ = ["Config", "setup_logging", "get_logger"]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        module = importlib.import_module(_LAZY[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + list(_LAZY))
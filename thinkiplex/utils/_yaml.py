@@ -0,0 +1,39 @@
+"""
+YAML helpers for ThinkiPlex.
+
+This module binds PyYAML to the libyaml C loader and dumper when they are available.
+"""
+
+from typing import IO, Any, Optional, Union
+
+import yaml
+
+# PyYAML only exposes the C classes when it was built against libyaml
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def safe_load(stream: Union[str, bytes, IO[Any]]) -> Any:
+    """Parse a YAML document using the fastest available safe loader.
+
+    Args:
+        stream: YAML string, bytes or open file
+
+    Returns:
+        Parsed document
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def safe_dump(data: Any, stream: Optional[IO[Any]] = None, **kwargs: Any) -> Any:
+    """Serialize data to YAML using the fastest available safe dumper.
+
+    Args:
+        data: Data to serialize
+        stream: Open file to write to (if None, the document is returned)
+        **kwargs: Extra arguments passed to yaml.dump
+
+    Returns:
+        The YAML document if no stream was given, otherwise None
+    """
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
@@ -11,12 +11,17 @@ from typing import Any, Dict, Optional
 import yaml
 from pydantic import ValidationError as PydanticValidationError
 
+from ._yaml import safe_dump, safe_load
 from .exceptions import ConfigError, ValidationError
 from .schemas import ThinkiPlexConfig
 from .logging import get_logger
 
 logger = get_logger()
 
+# Pydantic compiles the schema into a core validator when the model class is
+# defined; bind it once so validation is a single call with no kwargs unpacking
+_VALIDATE = ThinkiPlexConfig.model_validate
+
 
 class Config:
     """Configuration manager for ThinkiPlex."""
@@ -49,7 +54,7 @@ class Config:
 
         try:
             with open(self.config_file, "r") as f:
-                return yaml.safe_load(f)
+                return safe_load(f)
         except (yaml.YAMLError, IOError) as e:
             logger.error(f"Failed to load configuration: {e}")
             raise ConfigError(f"Failed to load configuration: {e}") from e
@@ -61,7 +66,7 @@ class Config:
             ValidationError: If the configuration is invalid
         """
         try:
-            ThinkiPlexConfig(**self.config)
+            _VALIDATE(self.config)
             logger.debug("Configuration validated successfully")
         except PydanticValidationError as e:
             logger.error(f"Invalid configuration: {e}")
@@ -94,7 +99,7 @@ class Config:
         }
 
         with open(self.config_file, "w") as f:
-            yaml.dump(default_config, f, default_flow_style=False)
+            safe_dump(default_config, f, default_flow_style=False)
 
         print(
             f"Default configuration created at {self.config_file}. Please edit it with your course details."
@@ -179,7 +184,7 @@ class Config:
             self.validate_config()
             
             with open(self.config_file, "w") as f:
-                yaml.dump(self.config, f, default_flow_style=False)
+                safe_dump(self.config, f, default_flow_style=False)
             logger.debug(f"Configuration saved to {self.config_file}")
         except (yaml.YAMLError, IOError) as e:
             logger.error(f"Failed to save configuration: {e}")
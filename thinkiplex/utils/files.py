@@ -0,0 +1,226 @@
+"""
+File utilities for ThinkiPlex.
+
+This module provides helpers for writing and copying files safely and cheaply.
+"""
+
+import os
+import re
+import shutil
+import sys
+from pathlib import Path
+from typing import Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+# Linux FICLONE ioctl request number (_IOW(0x94, 9, int))
+_FICLONE = 0x40049409
+
+# Chunk size for the copy_file_range and sendfile loops
+_COPY_CHUNK = 4 * 1024 * 1024
+
+# Buffer size for the userspace fallback; shutil's default is sized for small files
+_COPY_BUFSIZE = 1024 * 1024
+
+# Escapes for double-quoted .env values, and their inverse
+_ENV_ESCAPES = str.maketrans(
+    {"\\": "\\\\", '"': '\\"', "$": "\\$", "\n": "\\n", "\r": "\\r"}
+)
+_ENV_UNESCAPE_RE = re.compile(r"\\(.)")
+_ENV_UNESCAPES = {"n": "\n", "r": "\r"}
+
+
+def write_if_changed(path: Union[str, Path], data: bytes, mode: Optional[int] = None) -> bool:
+    """Atomically write data to a file unless it already has that content.
+
+    Skipping identical writes keeps the file's mtime stable, so mtime-based
+    caches downstream are not invalidated by idempotent re-runs.
+
+    Args:
+        path: File to write
+        data: Content to write
+        mode: Permission bits for the file, e.g. 0o600 for files holding
+            credentials. If None, the umask default applies.
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    path = Path(path)
+
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+
+    # Write next to the target and rename over it so readers never see a partial file
+    tmp_path = path.with_name(path.name + ".tmp")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(tmp_path, flags, 0o666 if mode is None else mode)
+    try:
+        if mode is not None:
+            # A leftover temp file keeps its old mode, so set it explicitly
+            os.chmod(tmp_path, mode)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+    return True
+
+
+def quote_env_value(value: str) -> str:
+    """Quote a value for a KEY="value" line in a .env file.
+
+    Backslashes, double quotes and dollar signs are escaped and line breaks
+    are written as \\n / \\r, so a value can neither end the quoted string
+    early nor start a new KEY= line.
+
+    Args:
+        value: Value to quote
+
+    Returns:
+        The value wrapped in double quotes
+    """
+    return '"' + str(value).translate(_ENV_ESCAPES) + '"'
+
+
+def unquote_env_value(value: str) -> str:
+    """Reverse quote_env_value for a value read from a .env file.
+
+    Values that are not double-quoted only have surrounding quotes removed.
+
+    Args:
+        value: Raw value after the ``=``
+
+    Returns:
+        The unquoted value
+    """
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return _ENV_UNESCAPE_RE.sub(
+            lambda m: _ENV_UNESCAPES.get(m.group(1), m.group(1)), value[1:-1]
+        )
+    return value.strip("\"'")
+
+
+def link_or_copy(src: Union[str, Path], dst: Union[str, Path]) -> None:
+    """Stage a read-only copy of a file as cheaply as the filesystem allows.
+
+    Tries a hardlink first and falls back to fast_copy, which reflinks or
+    copies in the kernel where it can. The destination is replaced if it exists.
+    Only use this when nothing writes to dst, since a hardlink shares the
+    source's data.
+
+    Args:
+        src: Source file
+        dst: Destination file
+    """
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+
+    fast_copy(src, dst)
+
+
+def fast_copy(src: Union[str, Path], dst: Union[str, Path]) -> Union[str, Path]:
+    """Copy a file using a reflink or an in-kernel copy where possible.
+
+    Tries a FICLONE reflink first (btrfs/XFS), then os.copy_file_range (which
+    the kernel may turn into a server-side or CoW copy), then an os.sendfile
+    loop, and finally a buffered copy with a 1 MiB buffer. Permission bits and
+    timestamps are carried over as with shutil.copy2.
+
+    Args:
+        src: Source file
+        dst: Destination file
+
+    Returns:
+        The destination path, so this can be used as a copytree copy_function
+    """
+    size = os.stat(src).st_size
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+        copied = False
+
+        if fcntl is not None and sys.platform.startswith("linux"):
+            try:
+                fcntl.ioctl(out_fd, _FICLONE, in_fd)
+                copied = True
+            except OSError:
+                pass
+
+        for kernel_copy in (_copy_file_range, _sendfile):
+            if copied:
+                break
+            try:
+                copied = kernel_copy(in_fd, out_fd, size)
+            except OSError:
+                copied = False
+            if not copied:
+                # Start over from a clean destination for the next method
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+
+        if not copied:
+            shutil.copyfileobj(fsrc, fdst, _COPY_BUFSIZE)
+
+    shutil.copystat(src, dst)
+    return dst
+
+
+def _copy_file_range(in_fd: int, out_fd: int, size: int) -> bool:
+    """Copy size bytes between file descriptors with os.copy_file_range.
+
+    Args:
+        in_fd: Source file descriptor
+        out_fd: Destination file descriptor
+        size: Number of bytes to copy
+
+    Returns:
+        True if the whole file was copied, False if the call is unavailable
+    """
+    if not hasattr(os, "copy_file_range"):
+        return False
+
+    offset = 0
+    while offset < size:
+        copied = os.copy_file_range(in_fd, out_fd, _COPY_CHUNK, offset, offset)
+        if copied == 0:
+            break
+        offset += copied
+    return offset >= size
+
+
+def _sendfile(in_fd: int, out_fd: int, size: int) -> bool:
+    """Copy size bytes between file descriptors with os.sendfile.
+
+    Args:
+        in_fd: Source file descriptor
+        out_fd: Destination file descriptor
+        size: Number of bytes to copy
+
+    Returns:
+        True if the whole file was copied, False if the call is unavailable
+    """
+    if not hasattr(os, "sendfile"):
+        return False
+
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(out_fd, in_fd, offset, _COPY_CHUNK)
+        if sent == 0:
+            break
+        offset += sent
+    return offset >= size
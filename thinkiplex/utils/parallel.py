@@ -5,7 +5,8 @@ This module provides functions for running tasks in parallel.
 """
 
 import concurrent.futures
-from typing import Any, Callable, Iterable, List, TypeVar
+import pickle
+from typing import Any, Callable, Dict, Iterable, List, TypeVar
 
 from .logging import get_logger
 
@@ -14,38 +15,80 @@ logger = get_logger()
 T = TypeVar('T')
 R = TypeVar('R')
 
+_EXECUTORS = {
+    "thread": concurrent.futures.ThreadPoolExecutor,
+    "process": concurrent.futures.ProcessPoolExecutor,
+}
+
+
+def _resolve_mode(func: Callable[..., Any], mode: str) -> str:
+    """Pick the executor type for a parallel_map call.
+
+    Args:
+        func: The function that will be executed
+        mode: "thread", "process" or "auto"
+
+    Returns:
+        "thread" or "process"
+
+    Raises:
+        ValueError: If the mode is not recognised
+    """
+    if mode == "auto":
+        # Only functions that can be pickled (module-level, not closures or
+        # lambdas) can be shipped to worker processes
+        try:
+            pickle.dumps(func)
+        except Exception:
+            return "thread"
+        return "process"
+
+    if mode not in _EXECUTORS:
+        raise ValueError(f"Unknown parallel mode: {mode!r}")
+
+    return mode
+
 
 def parallel_map(
     func: Callable[[T], R],
     items: Iterable[T],
     max_workers: int = 4,
-    timeout: int = None
+    timeout: int = None,
+    mode: str = "thread",
 ) -> List[R]:
     """Execute a function on multiple items in parallel.
-    
+
+    Use "thread" for IO-bound work, including callers that wrap ffmpeg or other
+    subprocesses (subprocess.run releases the GIL while it waits). Use "process"
+    for CPU-bound pure-Python work; the function and items must then be picklable.
+    "auto" picks "process" when the function can be pickled and "thread" otherwise.
+
     Args:
         func: The function to execute
         items: The items to process
-        max_workers: Maximum number of worker processes
+        max_workers: Maximum number of workers
         timeout: Timeout in seconds for each task
-        
+        mode: Executor type: "thread", "process" or "auto"
+
     Returns:
-        List of results
+        List of results, in the order of the successfully processed items
     """
-    results = []
-    
-    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+    executor_class = _EXECUTORS[_resolve_mode(func, mode)]
+    results: Dict[int, R] = {}
+
+    with executor_class(max_workers=max_workers) as executor:
         # Submit all tasks
-        future_to_item = {executor.submit(func, item): item for item in items}
-        
+        future_to_index = {
+            executor.submit(func, item): (index, item) for index, item in enumerate(items)
+        }
+
         # Process results as they complete
-        for future in concurrent.futures.as_completed(future_to_item, timeout=timeout):
-            item = future_to_item[future]
+        for future in concurrent.futures.as_completed(future_to_index, timeout=timeout):
+            index, item = future_to_index[future]
             try:
-                result = future.result()
-                results.append(result)
+                results[index] = future.result()
                 logger.debug(f"Successfully processed {item}")
             except Exception as e:
                 logger.error(f"Error processing {item}: {e}")
-                
-    return results
\ No newline at end of file
+
+    return [results[index] for index in sorted(results)]
@@ -7,6 +7,12 @@ This module provides Pydantic models for validating configuration.
 from typing import Dict, List, Optional, Union
 from pydantic import BaseModel, Field, validator, HttpUrl
 
+# Allowed values, built once at import instead of on every validator call
+VALID_QUALITIES = ("Original File", "1080p", "720p", "540p", "360p", "224p")
+VALID_AUDIO_FORMATS = ("mp3", "aac", "flac", "ogg")
+_VALID_QUALITY_SET = frozenset(VALID_QUALITIES)
+_VALID_AUDIO_FORMAT_SET = frozenset(VALID_AUDIO_FORMATS)
+
 
 class CourseConfig(BaseModel):
     """Schema for a course configuration."""
@@ -24,16 +30,14 @@ class CourseConfig(BaseModel):
     
     @validator("video_quality", "video_download_quality")
     def validate_quality(cls, v):
-        valid_qualities = ["Original File", "1080p", "720p", "540p", "360p", "224p"]
-        if v not in valid_qualities:
-            raise ValueError(f"Quality must be one of {valid_qualities}")
+        if v not in _VALID_QUALITY_SET:
+            raise ValueError(f"Quality must be one of {list(VALID_QUALITIES)}")
         return v
     
     @validator("audio_format")
     def validate_audio_format(cls, v):
-        valid_formats = ["mp3", "aac", "flac", "ogg"]
-        if v not in valid_formats:
-            raise ValueError(f"Audio format must be one of {valid_formats}")
+        if v not in _VALID_AUDIO_FORMAT_SET:
+            raise ValueError(f"Audio format must be one of {list(VALID_AUDIO_FORMATS)}")
         return v
 
 
@@ -49,16 +53,14 @@ class GlobalConfig(BaseModel):
     
     @validator("video_quality")
     def validate_quality(cls, v):
-        valid_qualities = ["Original File", "1080p", "720p", "540p", "360p", "224p"]
-        if v not in valid_qualities:
-            raise ValueError(f"Quality must be one of {valid_qualities}")
+        if v not in _VALID_QUALITY_SET:
+            raise ValueError(f"Quality must be one of {list(VALID_QUALITIES)}")
         return v
     
     @validator("audio_format")
     def validate_audio_format(cls, v):
-        valid_formats = ["mp3", "aac", "flac", "ogg"]
-        if v not in valid_formats:
-            raise ValueError(f"Audio format must be one of {valid_formats}")
+        if v not in _VALID_AUDIO_FORMAT_SET:
+            raise ValueError(f"Audio format must be one of {list(VALID_AUDIO_FORMATS)}")
         return v
 
 